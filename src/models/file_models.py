@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 
+from pandas.api.extensions import ExtensionArray
+
 
 @dataclass
 class DataQuality:
@@ -24,6 +26,8 @@ class FileInfo:
     shape: tuple
     columns: List[str]
     dtypes: Dict[str, str]
+    # Stable fingerprint of the parsed data, used as a cache key
+    content_hash: Optional[str] = None
 
 
 @dataclass
@@ -32,7 +36,20 @@ class ProcessedFile:
     data_quality: DataQuality
     sample_rows: List[Dict[str, Any]]
     column_statistics: Dict[str, Dict[str, Any]]
-    data_json: List[Dict[str, Any]]
+    # Not JSON despite the name: FileService stores {column: pandas array}, keeping each column's
+    # dtype so pd.DataFrame(data_json) rebuilds the uploaded frame; row records are still accepted
+    data_json: Union[Dict[str, ExtensionArray], List[Dict[str, Any]]]
+    # Column groupings derived once from column_statistics
+    numeric_cols: Optional[List[str]] = None
+    categorical_cols: Optional[List[str]] = None
+    
+    def __post_init__(self):
+        if self.numeric_cols is None:
+            self.numeric_cols = [col for col, stats in self.column_statistics.items()
+                                 if 'int' in stats.get('type', '') or 'float' in stats.get('type', '')]
+        if self.categorical_cols is None:
+            self.categorical_cols = [col for col, stats in self.column_statistics.items()
+                                     if stats.get('type', '') == 'object']
     
     @property
     def total_rows(self) -> int:
@@ -43,17 +60,7 @@ class ProcessedFile:
         return self.file_info.shape[1]
     
     def get_numeric_columns(self) -> List[str]:
-        numeric_cols = []
-        for col, stats in self.column_statistics.items():
-            col_type = stats.get('type', '')
-            if 'int' in col_type or 'float' in col_type:
-                numeric_cols.append(col)
-        return numeric_cols
+        return self.numeric_cols
     
     def get_categorical_columns(self) -> List[str]:
-        categorical_cols = []
-        for col, stats in self.column_statistics.items():
-            col_type = stats.get('type', '')
-            if col_type == 'object':
-                categorical_cols.append(col)
-        return categorical_cols
+        return self.categorical_cols
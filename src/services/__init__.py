@@ -2,10 +2,16 @@
 Service layer for DataSierra business logic
 """
 
-from .file_service import FileService
-from .ai_service import AIService
-from .data_service import DataService
-from .session_service import SessionService
+import importlib
+
+# Exported service -> defining submodule. Resolved on first access so importing one
+# service module (e.g. firebase_config) doesn't pull in the AI stack via this package
+_EXPORTS = {
+    'FileService': '.file_service',
+    'AIService': '.ai_service',
+    'DataService': '.data_service',
+    'SessionService': '.session_service',
+}
 
 __all__ = [
     'FileService',
@@ -13,3 +19,12 @@ __all__ = [
     'DataService',
     'SessionService'
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,7 +5,7 @@ OpenAI client for handling API interactions
 from openai import OpenAI
 import os
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime
 import time
 
@@ -64,9 +64,10 @@ class OpenAIClient:
         question: str, 
         data_context: str, 
         session_id: str = "default",
-        include_conversation: bool = True
+        include_conversation: bool = True,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
-        """Query OpenAI with data context"""
+        """Query OpenAI with data context; with on_token the answer is streamed and each piece passed to it"""
         try:
             # Build messages
             messages = []
@@ -84,15 +85,23 @@ class OpenAIClient:
             user_message = f"Data Context:\n{data_context}\n\nQuestion: {question}"
             messages.append({"role": "user", "content": user_message})
 
-            # Make API call
+            # Make API call; streamed responses only report usage when asked to
+            stream_kwargs = {}
+            if on_token is not None:
+                stream_kwargs = {"stream": True, "stream_options": {"include_usage": True}}
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 max_tokens=2000,
-                temperature=0.7
+                temperature=0.7,
+                **stream_kwargs
             )
 
-            answer = response.choices[0].message.content
+            if on_token is not None:
+                answer, tokens_used = self._collect_stream(response, on_token)
+            else:
+                answer = response.choices[0].message.content
+                tokens_used = response.usage.total_tokens
 
             # Store conversation
             self.conversation_memory.add_message(session_id, "user", user_message)
@@ -101,7 +110,7 @@ class OpenAIClient:
             return {
                 "success": True,
                 "answer": answer,
-                "tokens_used": response.usage.total_tokens,
+                "tokens_used": tokens_used,
                 "model": self.model
             }
 
@@ -113,6 +122,21 @@ class OpenAIClient:
                 "answer": "Sorry, I encountered an error while processing your request."
             }
 
+    @staticmethod
+    def _collect_stream(stream, on_token: Callable[[str], None]):
+        """Forward streamed content pieces to on_token and return (full answer, total tokens if reported)"""
+        pieces = []
+        tokens_used = None
+        for chunk in stream:
+            if chunk.choices:
+                piece = chunk.choices[0].delta.content
+                if piece:
+                    pieces.append(piece)
+                    on_token(piece)
+            if getattr(chunk, "usage", None):
+                tokens_used = chunk.usage.total_tokens
+        return "".join(pieces), tokens_used
+
     def generate_insights(self, data_summary: str) -> Dict[str, Any]:
         """Generate general insights from data summary"""
         try:
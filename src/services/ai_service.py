@@ -3,8 +3,10 @@ AI service for handling OpenAI and PandasAI interactions
 """
 
 import os
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -18,6 +20,9 @@ from .lida_visualization_service import LidaVisualizationService
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on LIDA visualization sets kept per AIService instance
+VISUALIZATION_CACHE_SIZE = 16
+
 
 class AIService:
     """Service for AI-powered data analysis"""
@@ -37,6 +42,7 @@ class AIService:
         
         self.model = model
         self.conversation_sessions = {}
+        self._visualization_cache: "OrderedDict[Tuple[str, str, int], List[Dict[str, Any]]]" = OrderedDict()
         
         # Initialize AI components
         self._initialize_ai_components()
@@ -76,8 +82,9 @@ class AIService:
             self.openai_client = None
             self.pandasai_processor = None
     
-    def process_query(self, request: QueryRequest, processed_files: Dict[str, ProcessedFile]) -> QueryResponse:
-        """Process a user query with AI analysis"""
+    def process_query(self, request: QueryRequest, processed_files: Dict[str, ProcessedFile],
+                      on_token: Optional[Callable[[str], None]] = None) -> QueryResponse:
+        """Process a user query with AI analysis; on_token, if given, receives the answer as it streams in"""
         try:
             if not self.openai_client:
                 return QueryResponse(
@@ -108,7 +115,8 @@ class AIService:
                 question=request.question,
                 data_context=data_context,
                 session_id=request.session_id,
-                include_conversation=True
+                include_conversation=True,
+                on_token=on_token
             )
             
             if not openai_response.get("success", False):
@@ -394,6 +402,16 @@ class AIService:
         if session_id in self.conversation_sessions:
             self.conversation_sessions[session_id].clear_history()
     
+    def record_cached_exchange(self, session_id: str, question: str, answer: str, processed_files: Dict[str, ProcessedFile]):
+        """Add a question answered from the cache to the conversation, as process_query would have"""
+        if not self.openai_client:
+            return
+        
+        data_context = self._build_data_context(processed_files, question)
+        memory = self.openai_client.conversation_memory
+        memory.add_message(session_id, "user", f"Data Context:\n{data_context}\n\nQuestion: {question}")
+        memory.add_message(session_id, "assistant", answer)
+    
     def get_all_sessions(self) -> Dict[str, Any]:
         """Get information about all active sessions"""
         sessions_info = {}
@@ -408,20 +426,42 @@ class AIService:
             return []
         
         try:
-            file_name = list(processed_files.keys())[0]
+            file_name = next(iter(processed_files))
             processed_file = processed_files[file_name]
             
             import pandas as pd
             data = pd.DataFrame(processed_file.data_json)
             
-            return self.lida_service.generate_visualizations(
+            # Identical data, context and count reuse the earlier LIDA round-trip
+            cache_key = (self._data_fingerprint(processed_file, data), insights_context, num_visualizations)
+            cached = self._visualization_cache.get(cache_key)
+            if cached is not None:
+                self._visualization_cache.move_to_end(cache_key)
+                return list(cached)
+            
+            visualizations = self.lida_service.generate_visualizations(
                 data=data,
                 insights_context=insights_context,
                 num_visualizations=num_visualizations
             )
+            
+            # Only cache real LIDA output; fallbacks should retry LIDA next time
+            if any(viz.get('type') == 'lida_generated' for viz in visualizations):
+                self._visualization_cache[cache_key] = visualizations
+                if len(self._visualization_cache) > VISUALIZATION_CACHE_SIZE:
+                    self._visualization_cache.popitem(last=False)
+            return list(visualizations)
         except Exception as e:
             return []
     
+    @staticmethod
+    def _data_fingerprint(processed_file: ProcessedFile, data) -> str:
+        """Content hash from upload time, else a hash of the DataFrame itself"""
+        if processed_file.file_info.content_hash:
+            return processed_file.file_info.content_hash
+        import pandas as pd
+        return hashlib.sha1(pd.util.hash_pandas_object(data, index=True).values.tobytes()).hexdigest()[:16]
+    
     def is_visualization_available(self) -> bool:
         """Check if visualization service is available"""
         return self.lida_service.is_available()
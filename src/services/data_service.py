@@ -21,8 +21,12 @@ class DataService:
     def get_data_preview(self, processed_file: ProcessedFile, n_rows: int = 10) -> pd.DataFrame:
         """Get data preview from processed file"""
         try:
+            data_json = processed_file.data_json
+            if isinstance(data_json, dict):
+                # Columnar data: slice each column so only the previewed rows are materialized
+                return pd.DataFrame({column: values[:n_rows] for column, values in data_json.items()})
             # Convert data_json back to DataFrame for preview
-            df = pd.DataFrame(processed_file.data_json)
+            df = pd.DataFrame(data_json)
             return df.head(n_rows)
         except Exception as e:
             logger.error(f"Error getting data preview: {str(e)}")
@@ -1,3 +1,4 @@
+import hashlib
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Any
@@ -50,7 +51,8 @@ class FileService:
                 upload_time=datetime.now(),
                 shape=df.shape,
                 columns=list(df.columns),
-                dtypes=df.dtypes.to_dict()
+                dtypes=df.dtypes.to_dict(),
+                content_hash=self._compute_content_hash(df)
             )
             
             # Calculate data quality
@@ -62,8 +64,9 @@ class FileService:
             # Calculate column statistics
             column_statistics = self._calculate_column_statistics(df)
             
-            # Convert to JSON
-            data_json = df.to_dict('records')
+            # Keep the data columnar: one array per column rebuilds a DataFrame without per-row unpacking.
+            # .array rather than .to_numpy() so nullable, categorical and tz-aware dtypes survive the round trip
+            data_json = {column: df[column].array for column in df.columns}
             
             return ProcessedFile(
                 file_info=file_info,
@@ -77,6 +80,16 @@ class FileService:
             logger.error(f"Error processing file {file.name}: {str(e)}")
             return None
     
+    def _compute_content_hash(self, df: pd.DataFrame) -> Optional[str]:
+        try:
+            row_hashes = pd.util.hash_pandas_object(df, index=True).values
+            digest = hashlib.sha1(row_hashes.tobytes())
+            digest.update(repr(list(df.columns)).encode('utf-8'))
+            return digest.hexdigest()
+        except Exception as e:
+            logger.warning(f"Could not hash data: {str(e)}")
+            return None
+    
     def process_files(self, files: List[Any]) -> Dict[str, ProcessedFile]:
         """Process multiple files"""
         processed_files = {}
@@ -1,21 +1,50 @@
 import os
+import threading
+from contextlib import contextmanager
 import firebase_admin
-from firebase_admin import credentials, firestore
-from typing import Optional
+from firebase_admin import credentials, firestore, storage
+from google.api_core import exceptions, retry
+from typing import Any, Dict, Iterator, Optional
 from pathlib import Path
 
 
+# Backoff for idempotent Firestore writes that fail with a transient server error
+WRITE_RETRY = retry.Retry(
+    predicate=retry.if_exception_type(
+        exceptions.DeadlineExceeded,
+        exceptions.InternalServerError,
+        exceptions.ServiceUnavailable,
+        exceptions.TooManyRequests,
+    ),
+    initial=0.1,
+    maximum=2.0,
+    multiplier=2.0,
+    timeout=30.0,
+)
+
+
 class FirebaseConfig:
     _app: Optional[firebase_admin.App] = None
     _db: Optional[firestore.Client] = None
     _last_error: Optional[str] = None
+    # Storage bucket handles shared by every service, keyed by bucket name
+    _buckets: Dict[str, Any] = {}
+    # Serializes first-time initialization so concurrent callers don't both create the default app
+    _init_lock = threading.Lock()
     
     @classmethod
     def initialize(cls, service_account_path: Optional[str] = None) -> bool:
-        try:
+        if cls._app is not None:
+            return True
+        
+        with cls._init_lock:
             if cls._app is not None:
                 return True
-            
+            return cls._initialize_locked(service_account_path)
+    
+    @classmethod
+    def _initialize_locked(cls, service_account_path: Optional[str]) -> bool:
+        try:
             if cls._initialize_with_env():
                 return True
             
@@ -98,6 +127,25 @@ class FirebaseConfig:
     def get_firestore_client(cls) -> Optional[firestore.Client]:
         return cls._db
     
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[Optional[Any]]:
+        """Collect Firestore writes made with the yielded batch and commit them in one request on exit."""
+        if cls._db is None:
+            yield None
+            return
+        
+        batch = cls._db.batch()
+        yield batch
+        batch.commit(retry=WRITE_RETRY)
+    
+    @classmethod
+    def get_storage_bucket(cls, name: str) -> Any:
+        """Return the shared handle for a Storage bucket, creating it on first use."""
+        if name not in cls._buckets:
+            cls._buckets[name] = storage.bucket(name=name)
+        return cls._buckets[name]
+    
     @classmethod
     def get_app(cls) -> Optional[firebase_admin.App]:
         return cls._app
@@ -1,22 +1,23 @@
 import os
-from firebase_admin import storage
 from firebase_admin import credentials, initialize_app
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, BinaryIO
 import logging
 
+from .firebase_config import FirebaseConfig
+
 logger = logging.getLogger(__name__)
 
 class FirebaseStorageService:
     
-    def __init__(self):
+    def __init__(self, bucket: Optional[Any] = None):
         self.bucket_name = f"{os.getenv('FIREBASE_PROJECT_ID', 'datasierra-5c806')}.firebasestorage.app"
-        self._bucket = None
+        self._bucket = bucket
     
     def _get_bucket(self):
         if self._bucket is None:
             try:
-                self._bucket = storage.bucket(name=self.bucket_name)
+                self._bucket = FirebaseConfig.get_storage_bucket(self.bucket_name)
             except Exception as e:
                 logger.error(f"Error getting Firebase Storage bucket: {e}")
                 return None
@@ -80,7 +81,7 @@ class FirebaseStorageService:
             logger.error(f"Failed to upload visualization {filename} to Firebase Storage: {e}")
             return None
 
-    def upload_chart_image(self, image_data: bytes, filename: str, user_id: str, query: str) -> Optional[Dict[str, Any]]:
+    def upload_chart_image(self, image_data: bytes, filename: str, user_id: str, query: str, content_type: str = 'image/png') -> Optional[Dict[str, Any]]:
         """Uploads a chart image to Firebase Storage."""
         bucket = self._get_bucket()
         if not bucket:
@@ -91,7 +92,7 @@ class FirebaseStorageService:
             blob_path = f"users/{user_id}/chart_images/{timestamp}_{filename}"
             blob = bucket.blob(blob_path)
             
-            blob.upload_from_string(image_data, content_type='image/png')
+            blob.upload_from_string(image_data, content_type=content_type)
             blob.make_public()
             
             logger.info(f"Chart image {filename} uploaded to {blob_path}")
@@ -101,7 +102,37 @@ class FirebaseStorageService:
                 "storage_path": blob_path,
                 "original_filename": filename,
                 "file_size": len(image_data),
-                "content_type": 'image/png',
+                "content_type": content_type,
+                "created_at": datetime.utcnow().isoformat(),
+                "query": query,
+                "user_id": user_id
+            }
+        except Exception as e:
+            logger.error(f"Failed to upload chart image {filename} to Firebase Storage: {e}")
+            return None
+
+    def upload_chart_image_stream(self, image_stream: BinaryIO, filename: str, user_id: str, query: str, content_type: str = 'image/png') -> Optional[Dict[str, Any]]:
+        """Uploads a chart image from a file-like object without copying it into a bytes object first."""
+        bucket = self._get_bucket()
+        if not bucket:
+            return None
+        
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+            blob_path = f"users/{user_id}/chart_images/{timestamp}_{filename}"
+            blob = bucket.blob(blob_path)
+            
+            blob.upload_from_file(image_stream, rewind=True, content_type=content_type)
+            blob.make_public()
+            
+            logger.info(f"Chart image {filename} uploaded to {blob_path}")
+            
+            return {
+                "file_url": blob.public_url,
+                "storage_path": blob_path,
+                "original_filename": filename,
+                "file_size": blob.size,
+                "content_type": content_type,
                 "created_at": datetime.utcnow().isoformat(),
                 "query": query,
                 "user_id": user_id
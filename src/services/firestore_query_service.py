@@ -1,19 +1,25 @@
 # Firestore query storage service
 
-from typing import Dict, List, Optional, Any
+import hashlib
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from firebase_admin import firestore
+from google.api_core import exceptions
 
-from .firebase_config import FirebaseConfig
+from .firebase_config import FirebaseConfig, WRITE_RETRY
 from ..models.query_models import QueryHistory
 
 
+# Firestore rejects write batches larger than this
+MAX_BATCH_OPS = 500
+
+
 class FirestoreQueryService:
     
     def __init__(self):
         self.db = FirebaseConfig.get_firestore_client()
     
-    def save_query(self, user_uid: str, query: str, response: str, file_name: str) -> Optional[str]:
+    def save_query(self, user_uid: str, query: str, response: str, file_name: str, batch: Optional[Any] = None) -> Optional[str]:
         try:
             if not self.db:
                 return None
@@ -27,15 +33,27 @@ class FirestoreQueryService:
                 'created_at': datetime.utcnow()
             }
             
+            # Same question on the same file maps to the same document, so
+            # resubmitting refreshes it and moves it to the top of history.
+            # Overwrite rather than merge: feedback and helpfulness belonged to the old answer
+            doc_id = self._query_doc_id(query, file_name)
             
-            # Add to user's queries subcollection
-            doc_ref = self.db.collection('users').document(user_uid).collection('queries').add(query_data)
+            doc_ref = self.db.collection('users').document(user_uid).collection('queries').document(doc_id)
+            if batch is not None:
+                batch.set(doc_ref, query_data)
+            else:
+                doc_ref.set(query_data, retry=WRITE_RETRY)
             
-            return doc_ref[1].id if doc_ref else None
+            return doc_id
             
         except Exception as e:
             return None
     
+    @staticmethod
+    def _query_doc_id(query: str, file_name: str) -> str:
+        key = f"{file_name}\0{query.strip()}"
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+    
     def get_user_queries(self, user_uid: str, limit: int = 10, order_by: str = 'timestamp') -> List[Dict[str, Any]]:
         try:
             if not self.db:
@@ -53,6 +71,9 @@ class FirestoreQueryService:
                 data = doc.to_dict()
                 # Add document ID to the data
                 data['id'] = doc.id
+                # Lowercased copies so history search doesn't re-lower per keystroke
+                data['_query_lc'] = (data.get('query') or '').lower()
+                data['_response_lc'] = (data.get('response') or '').lower()
                 queries.append(data)
             
             return queries
@@ -146,7 +167,7 @@ class FirestoreQueryService:
             doc_ref.update({
                 'feedback': feedback,
                 'feedback_updated_at': datetime.utcnow()
-            })
+            }, retry=WRITE_RETRY)
             
             return True
             
@@ -248,7 +269,61 @@ class FirestoreQueryService:
             doc_ref.update({
                 'is_helpful': is_helpful,
                 'helpfulness_updated_at': datetime.utcnow().isoformat()
-            })
+            }, retry=WRITE_RETRY)
             return True
         except Exception as e:
-            return False
\ No newline at end of file
+            return False
+    
+    def batch_update(self, user_uid: str, pending: Dict[str, Tuple[str, Any]]) -> Dict[str, str]:
+        """
+        Apply buffered per-query changes using Firestore write batches
+        
+        A batch that fails (e.g. one of its queries was deleted in another tab)
+        is retried one change at a time, so only the failing changes are lost.
+        
+        Args:
+            user_uid: User's Firebase UID
+            pending: Mapping of query ID to an operation, either
+                ('helpful', bool) or ('delete', None)
+            
+        Returns:
+            Query IDs whose change was not applied, mapped to 'missing' (the
+            query no longer exists) or 'error'; empty if everything was written
+        """
+        if not self.db:
+            return {query_id: 'error' for query_id in pending}
+        
+        queries_ref = self.db.collection('users').document(user_uid).collection('queries')
+        updated_at = datetime.utcnow().isoformat()
+        items = list(pending.items())
+        failed = {}
+        
+        for start in range(0, len(items), MAX_BATCH_OPS):
+            chunk = items[start:start + MAX_BATCH_OPS]
+            try:
+                batch = self.db.batch()
+                for query_id, (op, value) in chunk:
+                    self._queue_change(batch, queries_ref.document(query_id), op, value, updated_at)
+                batch.commit(retry=WRITE_RETRY)
+            except Exception:
+                for query_id, (op, value) in chunk:
+                    try:
+                        batch = self.db.batch()
+                        self._queue_change(batch, queries_ref.document(query_id), op, value, updated_at)
+                        batch.commit(retry=WRITE_RETRY)
+                    except exceptions.NotFound:
+                        failed[query_id] = 'missing'
+                    except Exception:
+                        failed[query_id] = 'error'
+        
+        return failed
+    
+    @staticmethod
+    def _queue_change(batch: Any, doc_ref: Any, op: str, value: Any, updated_at: str):
+        if op == 'delete':
+            batch.delete(doc_ref)
+        elif op == 'helpful':
+            batch.update(doc_ref, {
+                'is_helpful': value,
+                'helpfulness_updated_at': updated_at
+            })
@@ -1,14 +1,8 @@
+import logging
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import base64
-import io
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional
 from datetime import datetime
-import os
 
 try:
     from lida import Manager, TextGenerationConfig, llm
@@ -20,11 +14,13 @@ except Exception as e:
     LIDA_AVAILABLE = False
     LIDA_IMPORT_ERROR = str(e)
 
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
 # Fallback for Python 3.8 - create a simple visualization service
 if not LIDA_AVAILABLE:
-    print("LIDA not available, using fallback visualization service")
-
-from ..config import Config
+    logger.warning("LIDA not available, using fallback visualization service")
 
 
 class LidaVisualizationService:
@@ -279,7 +275,7 @@ class LidaVisualizationService:
                 })
             
         except Exception as e:
-            print(f"Error generating fallback visualizations: {e}")
+            logger.error(f"Error generating fallback visualizations: {e}")
         
         return visualizations
     
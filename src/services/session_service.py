@@ -21,8 +21,8 @@ class SessionService:
         self.firestore_service = FirestoreQueryService()
         self.auth_service = AuthService()
     
-    def save_query_history(self, query: str, response: str, file_name: str) -> int:
-        """Save query to history and Firestore, return query ID"""
+    def save_query_history(self, query: str, response: str, file_name: str, batch: Optional[Any] = None) -> int:
+        """Save query to history and Firestore (queued on batch if one is given), return query ID"""
         # Save to local memory (for backward compatibility)
         query_id = self.current_query_id
         query_history_entry = QueryHistory(
@@ -40,7 +40,7 @@ class SessionService:
         if self.auth_service.is_authenticated():
             user_uid = self.auth_service.get_user_uid()
             if user_uid:
-                self.firestore_service.save_query(user_uid, query, response, file_name)
+                self.firestore_service.save_query(user_uid, query, response, file_name, batch=batch)
         
         return query_id
     
@@ -2,31 +2,76 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from firebase_admin import firestore
 
-from .firebase_config import FirebaseConfig
+from .firebase_config import FirebaseConfig, WRITE_RETRY
+from .firestore_query_service import MAX_BATCH_OPS
 
 class VisualizationService:
     
-    def __init__(self):
-        self.db = FirebaseConfig.get_firestore_client()
+    def __init__(self, db: Optional[firestore.Client] = None):
+        self.db = db if db is not None else FirebaseConfig.get_firestore_client()
     
-    def save_visualization(self, user_uid: str, viz_data: Dict[str, Any]) -> Optional[str]:
+    def save_visualization(self, user_uid: str, viz_data: Dict[str, Any], batch: Optional[Any] = None) -> Optional[str]:
         try:
             if not self.db:
                 return None
             
-            # Add default fields if not present
-            viz_data['created_at'] = viz_data.get('created_at', datetime.utcnow().isoformat())
-            viz_data['helpfulness_updated_at'] = None
-            viz_data['is_helpful'] = None
-            viz_data['user_id'] = user_uid # Ensure user_id is explicitly stored
+            self._apply_defaults(user_uid, viz_data)
             
-            doc_ref = self.db.collection('users').document(user_uid).collection('visualisations').add(viz_data)
+            viz_ref = self.db.collection('users').document(user_uid).collection('visualisations')
+            
+            # Pick the document ID up front: later writes in a batch can refer to it,
+            # and retrying a set() on a known ID can't create a second document
+            doc_ref = viz_ref.document()
+            if batch is not None:
+                batch.set(doc_ref, viz_data)
+            else:
+                doc_ref.set(viz_data, retry=WRITE_RETRY)
             
-            return doc_ref[1].id if doc_ref else None
+            return doc_ref.id
             
         except Exception as e:
             return None
     
+    def save_visualizations_batch(self, user_uid: str, viz_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save several visualizations using Firestore write batches.
+        
+        Args:
+            user_uid: User's Firebase UID
+            viz_list: Visualization metadata dicts, as passed to save_visualization
+            
+        Returns:
+            Document IDs in the order of viz_list, or an empty list on failure
+        """
+        try:
+            if not self.db:
+                return []
+            
+            viz_ref = self.db.collection('users').document(user_uid).collection('visualisations')
+            viz_ids = []
+            
+            for start in range(0, len(viz_list), MAX_BATCH_OPS):
+                batch = self.db.batch()
+                for viz_data in viz_list[start:start + MAX_BATCH_OPS]:
+                    self._apply_defaults(user_uid, viz_data)
+                    doc_ref = viz_ref.document()
+                    batch.set(doc_ref, viz_data)
+                    viz_ids.append(doc_ref.id)
+                batch.commit(retry=WRITE_RETRY)
+            
+            return viz_ids
+            
+        except Exception as e:
+            return []
+    
+    @staticmethod
+    def _apply_defaults(user_uid: str, viz_data: Dict[str, Any]):
+        # Add default fields if not present
+        viz_data['created_at'] = viz_data.get('created_at', datetime.utcnow().isoformat())
+        viz_data['helpfulness_updated_at'] = None
+        viz_data['is_helpful'] = None
+        viz_data['user_id'] = user_uid # Ensure user_id is explicitly stored
+    
     def get_user_visualizations(self, user_uid: str, limit: int = 10, order_by: str = 'created_at') -> List[Dict[str, Any]]:
         """
         Get user's visualizations from Firestore.
@@ -58,19 +103,24 @@ class VisualizationService:
         except Exception as e:
             return []
 
-    def update_visualization_helpfulness(self, user_uid: str, viz_id: str, is_helpful: bool) -> bool:
+    def update_visualization_helpfulness(self, user_uid: str, viz_id: str, is_helpful: bool, batch: Optional[Any] = None) -> bool:
         """
         Update the helpfulness status of a visualization.
+        With a batch, the update is queued and sent when the batch commits.
         """
         try:
             if not self.db:
                 return False
             
             doc_ref = self.db.collection('users').document(user_uid).collection('visualisations').document(viz_id)
-            doc_ref.update({
+            update = {
                 'is_helpful': is_helpful,
                 'helpfulness_updated_at': datetime.utcnow().isoformat()
-            })
+            }
+            if batch is not None:
+                batch.update(doc_ref, update)
+            else:
+                doc_ref.update(update, retry=WRITE_RETRY)
             return True
         except Exception as e:
             return False
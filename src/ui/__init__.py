@@ -2,8 +2,16 @@
 UI components for DataSierra
 """
 
-from .components import FileUploadComponent, DataPreviewComponent, QueryInterfaceComponent, HistoryComponent
-from .pages import MainPage
+import importlib
+
+# Exported name -> defining subpackage, resolved on first access (see src/services/__init__.py)
+_EXPORTS = {
+    'FileUploadComponent': '.components',
+    'DataPreviewComponent': '.components',
+    'QueryInterfaceComponent': '.components',
+    'HistoryComponent': '.components',
+    'MainPage': '.pages',
+}
 
 __all__ = [
     'FileUploadComponent',
@@ -12,3 +20,12 @@ __all__ = [
     'HistoryComponent',
     'MainPage'
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
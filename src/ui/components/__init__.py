@@ -2,10 +2,15 @@
 UI components for DataSierra
 """
 
-from .file_upload import FileUploadComponent
-from .data_preview import DataPreviewComponent
-from .query_interface import QueryInterfaceComponent
-from .history import HistoryComponent
+import importlib
+
+# Exported component -> defining submodule, resolved on first access (see src/services/__init__.py)
+_EXPORTS = {
+    'FileUploadComponent': '.file_upload',
+    'DataPreviewComponent': '.data_preview',
+    'QueryInterfaceComponent': '.query_interface',
+    'HistoryComponent': '.history',
+}
 
 __all__ = [
     'FileUploadComponent',
@@ -13,3 +18,12 @@ __all__ = [
     'QueryInterfaceComponent', 
     'HistoryComponent'
 ]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
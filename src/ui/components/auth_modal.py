@@ -5,6 +5,7 @@ Authentication modal component
 import streamlit as st
 from typing import Optional, Callable
 from ...services.auth_service import AuthService
+from .query_interface import clear_query_cache
 
 
 class AuthModalComponent:
@@ -41,6 +42,8 @@ class AuthModalComponent:
                 
                 if st.button("🚪 Logout", key="logout_btn"):
                     self.auth_service.sign_out()
+                    # Answers about the previous user's data shouldn't outlive their login
+                    clear_query_cache()
                     st.rerun()
             else:
                 # Show login button
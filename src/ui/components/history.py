@@ -1,14 +1,56 @@
 # Query history component
 
+import gzip
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import escape as _html_escape
+from itertools import islice
+
 import streamlit as st
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 
-from ...models.query_models import QueryHistory
 from ...services.session_service import SessionService
 from ...services.visualization_service import VisualizationService
 from ...services.firestore_query_service import FirestoreQueryService
 
 
+# Shared card styles, injected once per run instead of inlined into every card
+_CARD_CSS = """
+<style>
+.qcard { border: 1px solid #ddd; border-radius: 5px; padding: 10px; margin: 5px 0; background-color: #f9f9f9; }
+.qcard .qdate { color: #1f4e79; font-weight: 600; margin-bottom: 0.5rem; }
+.qcard .qline { color: #333; line-height: 1.4; }
+.qcard .qfile { color: #333; margin-bottom: 0.3rem; }
+</style>
+"""
+
+
+# Buffered history changes are written automatically once the oldest is this many seconds old
+FEEDBACK_FLUSH_DELAY = 10
+# How often (seconds) the unsaved-changes banner refreshes and checks the flush timer
+FEEDBACK_POLL_INTERVAL = 2
+
+# Number of HTML visualizations downloaded in the background when the history list loads
+VIZ_PREFETCH_COUNT = 5
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.svg')
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="viz-prefetch")
+
+
+def _download_visualization_html(file_url: str) -> bytes:
+    """Download a stored HTML visualization and gzip it; Plotly pages compress several-fold"""
+    import requests
+    response = requests.get(file_url, timeout=10)
+    # Raise rather than return None so st.cache_data doesn't remember the failure
+    response.raise_for_status()
+    return gzip.compress(response.content)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_visualization_html(file_url: str) -> bytes:
+    """Fetch a stored HTML visualization (gzipped), cached per URL so repeat views skip the download"""
+    return _download_visualization_html(file_url)
+
+
 class HistoryComponent:
     
     def __init__(self, session_service: SessionService):
@@ -17,6 +59,7 @@ class HistoryComponent:
         self.firestore_query_service = FirestoreQueryService()
     
     def render_sidebar(self):
+        st.html(_CARD_CSS)
         st.markdown("# Navigation")
         
         # Query History
@@ -27,24 +70,26 @@ class HistoryComponent:
                 st.info("Please log in to view query history")
             else:
                 # Get queries from Firestore
-                queries = self.firestore_query_service.get_user_queries(user_id, limit=10)
+                queries = self.firestore_query_service.get_user_queries(user_id, limit=10, order_by='created_at')
                 
                 if queries:
                     # Search functionality
                     search_term = st.text_input("🔍 Search history:", key="history_search")
                     
                     # Filter queries based on search
-                    filtered_queries = queries
+                    filtered_queries = self._without_pending_deletes(queries)
                     if search_term:
-                        filtered_queries = [
-                            query for query in queries
-                            if search_term.lower() in query.get('query', '').lower() or 
-                               search_term.lower() in query.get('response', '').lower()
-                        ]
+                        needle = search_term.lower()
+                        filtered_queries = (
+                            query for query in filtered_queries
+                            if needle in query['_query_lc'] or needle in query['_response_lc']
+                        )
                     
                     # Display queries
                     for query in filtered_queries:
                         self._render_firestore_query_item(query)
+                    
+                    self._render_pending_feedback_controls(user_id, key="save_feedback_sidebar")
                 else:
                     st.info("No queries yet. Start by asking a question!")
         
@@ -52,69 +97,6 @@ class HistoryComponent:
         with st.expander("📊 Visualizations History", expanded=True):
             self._render_visualization_history()
     
-    def _render_history_item(self, item: QueryHistory):
-        """Render a single history item with collapsible response"""
-        # Create a container for each history item
-        with st.container():
-            # Header with timestamp and file
-            st.markdown(f"""
-            <div style="border: 1px solid #ddd; border-radius: 5px; padding: 10px; margin: 5px 0; background-color: #f9f9f9;">
-                <div style="color: #1f4e79; font-weight: 600; margin-bottom: 0.5rem;">
-                    📅 {item.timestamp.strftime('%b %d %H:%M')}
-                </div>
-                <div style="color: #333; margin-bottom: 0.3rem;">
-                    <strong>📁 File:</strong> {item.file_name}
-                </div>
-                <div style="color: #333; line-height: 1.4;">
-                    <strong>❓ Query:</strong> {item.query[:60]}{'...' if len(item.query) > 60 else ''}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Check current view state
-            view_key = f"view_response_{item.id}"
-            is_viewing = st.session_state.get(view_key, False)
-            
-            # Action buttons (matching visualization history format)
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                # Dynamic button text based on current state
-                button_text = "🙈 Hide" if is_viewing else "👁️ View"
-                if st.button(button_text, key=f"view_{item.id}"):
-                    # Toggle view state
-                    st.session_state[view_key] = not is_viewing
-                    st.rerun()
-            
-            with col2:
-                if st.button("👍", key=f"thumbs_up_{item.id}"):
-                    # TODO: Implement query helpfulness feedback
-                    st.success("Marked as helpful!")
-                    st.rerun()
-            
-            with col3:
-                if st.button("👎", key=f"thumbs_down_{item.id}"):
-                    # TODO: Implement query helpfulness feedback
-                    st.success("Marked as not helpful!")
-                    st.rerun()
-            
-            with col4:
-                if st.button("🗑️", key=f"delete_{item.id}"):
-                    # Delete query from database
-                    user_id = st.session_state.get('user', {}).get('uid')
-                    if user_id and self.firestore_query_service.delete_query(user_id, str(item.id)):
-                        st.success("Query deleted!")
-                        st.rerun()
-                    else:
-                        st.error("Failed to delete query")
-            
-            # Show response if view is active
-            if is_viewing:
-                st.markdown("**🤖 Response:**")
-                # Escape HTML characters in the response to prevent rendering issues
-                escaped_response = self._escape_html(item.response)
-                st.markdown(escaped_response)
-                st.markdown("---")
-    
     def render_main_page(self):
         st.markdown("### 📚 Query History")
         
@@ -125,7 +107,7 @@ class HistoryComponent:
             return
         
         # Get queries from Firestore
-        queries = self.firestore_query_service.get_user_queries(user_id, limit=50)
+        queries = self.firestore_query_service.get_user_queries(user_id, limit=50, order_by='created_at')
         
         if not queries:
             st.info("No query history available.")
@@ -138,17 +120,24 @@ class HistoryComponent:
         with col2:
             limit = st.selectbox("Show last:", [10, 25, 50, 100], index=1)
         
-        # Filter queries based on search
-        filtered_queries = queries
+        # Filter queries based on search, stopping once `limit` matches are found
+        filtered_queries = self._without_pending_deletes(queries)
         if search_term:
-            filtered_queries = [
-                query for query in queries
-                if search_term.lower() in query.get('query', '').lower() or 
-                   search_term.lower() in query.get('response', '').lower()
-            ]
+            needle = search_term.lower()
+            filtered_queries = (
+                query for query in filtered_queries
+                if needle in query['_query_lc'] or needle in query['_response_lc']
+            )
+        filtered_queries = list(islice(filtered_queries, limit))
+        
+        # Only rows the user has opened get their body and action buttons built
+        open_ids = self._open_ids()
+        pending = self._pending_feedback()
         
         # Display queries
-        for query in filtered_queries[:limit]:
+        for query in filtered_queries:
+            query_id = query.get('id', 'unknown')
+            
             # Format timestamp
             created_at = query.get('created_at', 'Unknown date')
             if hasattr(created_at, 'strftime'):
@@ -158,7 +147,19 @@ class HistoryComponent:
             else:
                 formatted_date = 'Unknown date'
             
-            with st.expander(f"📅 {formatted_date} - {query.get('file_name', 'Unknown file')}", expanded=False):
+            open_key = f"main:{query_id}"
+            is_open = open_key in open_ids
+            header_col, toggle_col = st.columns([5, 1])
+            with header_col:
+                st.markdown(f"**📅 {formatted_date} - {query.get('file_name', 'Unknown file')}**")
+            with toggle_col:
+                st.button("Close" if is_open else "Open", key=f"main_open_{query_id}",
+                          on_click=self._toggle_view, args=(open_key,))
+            
+            if not is_open:
+                continue
+            
+            with st.container(border=True):
                 # Query details
                 st.markdown(f"**📁 File:** {query.get('file_name', 'Unknown file')}")
                 st.markdown(f"**❓ Query:** {query.get('query', 'No query')}")
@@ -168,38 +169,24 @@ class HistoryComponent:
                 escaped_response = self._escape_html(query.get('response', ''))
                 st.markdown(escaped_response)
                 
-                # Action buttons (matching visualization history format)
-                col1, col2, col3, col4 = st.columns(4)
+                # Action buttons
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    if st.button("👁️ View", key=f"main_view_{query.get('id', 'unknown')}"):
-                        st.info("Use the sidebar to view full response")
+                    if st.button("👍", key=f"main_thumbs_up_{query_id}"):
+                        # Buffered until saved by _render_pending_feedback_controls
+                        pending[query_id] = ('helpful', True)
+                        st.success("Marked as helpful!")
                 with col2:
-                    if st.button("👍", key=f"main_thumbs_up_{query.get('id', 'unknown')}"):
-                        # Update query helpfulness in database
-                        user_id = st.session_state.get('user', {}).get('uid')
-                        if user_id and self.firestore_query_service.update_query_helpfulness(user_id, query.get('id'), True):
-                            st.success("Marked as helpful!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to update feedback")
+                    if st.button("👎", key=f"main_thumbs_down_{query_id}"):
+                        pending[query_id] = ('helpful', False)
+                        st.success("Marked as not helpful!")
                 with col3:
-                    if st.button("👎", key=f"main_thumbs_down_{query.get('id', 'unknown')}"):
-                        # Update query helpfulness in database
-                        user_id = st.session_state.get('user', {}).get('uid')
-                        if user_id and self.firestore_query_service.update_query_helpfulness(user_id, query.get('id'), False):
-                            st.success("Marked as not helpful!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to update feedback")
-                with col4:
-                    if st.button("🗑️", key=f"main_delete_{query.get('id', 'unknown')}"):
-                        # Delete query from database
-                        user_id = st.session_state.get('user', {}).get('uid')
-                        if user_id and self.firestore_query_service.delete_query(user_id, query.get('id')):
-                            st.success("Query deleted!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to delete query")
+                    if st.button("🗑️", key=f"main_delete_{query_id}"):
+                        pending[query_id] = ('delete', None)
+                        open_ids.discard(open_key)
+                        st.rerun()
+        
+        self._render_pending_feedback_controls(user_id, key="save_feedback_main")
     
     def render_statistics(self):
         """Render history statistics"""
@@ -276,18 +263,22 @@ class HistoryComponent:
             st.info("No visualizations yet. Generate some charts to see them here!")
             return
         
+        self._prefetch_visualizations(visualizations[:VIZ_PREFETCH_COUNT])
+        
         # Filter visualizations based on search
         filtered_viz = visualizations
         if search_term:
-            filtered_viz = [
+            needle = search_term.lower()
+            filtered_viz = (
                 viz for viz in visualizations
-                if search_term.lower() in viz.get('query', '').lower()
-            ]
+                if needle in viz.get('query', '').lower()
+            )
         
         # Display visualizations
         for viz in filtered_viz:
             self._render_visualization_item(viz)
     
+    @st.fragment
     def _render_visualization_item(self, viz: Dict[str, Any]):
         """Render a single visualization item"""
         with st.container():
@@ -304,28 +295,24 @@ class HistoryComponent:
                 # Fallback
                 formatted_date = 'Unknown date'
             
-            st.markdown(f"""
-            <div style="border: 1px solid #ddd; border-radius: 5px; padding: 10px; margin: 5px 0; background-color: #f9f9f9;">
-                <div style="color: #1f4e79; font-weight: 600; margin-bottom: 0.5rem;">
-                    📅 {formatted_date}
-                </div>
-                <div style="color: #333; line-height: 1.4;">
-                    <strong>❓ Query:</strong> {viz.get('query', 'No query')[:60]}{'...' if len(viz.get('query', '')) > 60 else ''}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(
+                f'<div class="qcard"><div class="qdate">📅 {formatted_date}</div>'
+                f'<div class="qline"><strong>❓ Query:</strong> '
+                f"{viz.get('query', 'No query')[:60]}{'...' if len(viz.get('query', '')) > 60 else ''}</div></div>",
+                unsafe_allow_html=True
+            )
             
             # Check current view state
-            view_key = f"view_viz_{viz.get('id', 'unknown')}"
-            is_viewing = st.session_state.get(view_key, False)
+            view_key = f"viz:{viz.get('id', 'unknown')}"
+            is_viewing = view_key in self._open_ids()
             
             # Action buttons
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 button_text = "🙈 Hide" if is_viewing else "👁️ View"
-                if st.button(button_text, key=f"view_viz_{viz.get('id', 'unknown')}"):
-                    st.session_state[view_key] = not is_viewing
-                    st.rerun()
+                # Toggled in a callback so the fragment's own rerun picks up the new state
+                st.button(button_text, key=f"view_viz_{viz.get('id', 'unknown')}",
+                          on_click=self._toggle_view, args=(view_key,))
             
             with col2:
                 if st.button("👍", key=f"thumbs_up_{viz.get('id', 'unknown')}"):
@@ -335,7 +322,6 @@ class HistoryComponent:
                         True
                     )
                     st.success("Marked as helpful!")
-                    st.rerun()
             
             with col3:
                 if st.button("👎", key=f"thumbs_down_{viz.get('id', 'unknown')}"):
@@ -345,7 +331,6 @@ class HistoryComponent:
                         False
                     )
                     st.success("Marked as not helpful!")
-                    st.rerun()
             
             with col4:
                 if st.button("🗑️", key=f"delete_{viz.get('id', 'unknown')}"):
@@ -365,19 +350,18 @@ class HistoryComponent:
                 # Check if it's an image URL or HTML content
                 file_url = viz.get('file_url', '')
                 if file_url:
-                    if file_url.endswith('.png') or file_url.endswith('.jpg') or file_url.endswith('.jpeg'):
+                    if file_url.endswith(_IMAGE_EXTENSIONS):
                         # Display image
                         st.image(file_url, caption=viz.get('query', 'Generated visualization'))
                     else:
                         # Display HTML content
                         import streamlit.components.v1 as components
                         try:
-                            import requests
-                            response = requests.get(file_url)
-                            if response.status_code == 200:
-                                components.html(response.text, height=500, scrolling=True)
-                            else:
-                                st.error("Could not load visualization")
+                            html_gz = self._prefetched_html(file_url)
+                            if html_gz is None:
+                                html_gz = _fetch_visualization_html(file_url)
+                            html_content = gzip.decompress(html_gz).decode('utf-8', errors='replace')
+                            components.html(html_content, height=500, scrolling=True)
                         except Exception as e:
                             st.error(f"Error loading visualization: {str(e)}")
                 else:
@@ -385,93 +369,185 @@ class HistoryComponent:
                 
                 st.markdown("---")
     
-    def _escape_html(self, text: str) -> str:
-        if not text:
-            return ""
+    def _pending_feedback(self) -> Dict[str, Tuple[str, Any]]:
+        """Buffered query changes keyed by query ID, flushed by _render_pending_feedback_controls"""
+        return st.session_state.setdefault('pending_feedback', {})
+    
+    def _without_pending_deletes(self, queries: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        pending = self._pending_feedback()
+        return (query for query in queries if pending.get(query.get('id'), (None,))[0] != 'delete')
+    
+    def _render_pending_feedback_controls(self, user_id: str, key: str):
+        """Show unsaved changes with a save button; they are also written automatically after FEEDBACK_FLUSH_DELAY"""
+        self._show_pending_feedback_message()
+        
+        # The polling fragment is only registered while there is something to save
+        if not self._pending_feedback():
+            st.session_state.pop('pending_feedback_since', None)
+            return
         
-        # Replace common HTML characters with their escaped equivalents
-        html_escape_table = {
-            "&": "&amp;",
-            '"': "&quot;",
-            "'": "&#x27;",
-            ">": "&gt;",
-            "<": "&lt;",
-        }
+        self._render_pending_feedback_status(user_id, key)
+    
+    @st.fragment(run_every=FEEDBACK_POLL_INTERVAL)
+    def _render_pending_feedback_status(self, user_id: str, key: str):
+        """Polls so the count follows changes made in card fragments and the flush timer fires without a click"""
+        pending = self._pending_feedback()
+        since = st.session_state.setdefault('pending_feedback_since', time.monotonic())
+        if pending and time.monotonic() - since >= FEEDBACK_FLUSH_DELAY:
+            # Written in place, so only this fragment redraws
+            self._flush_pending_feedback(user_id)
+        
+        self._show_pending_feedback_message()
+        if not pending:
+            # Stays idle until the next full rerun stops the timer
+            return
         
-        escaped_text = text
-        for char, escaped in html_escape_table.items():
-            escaped_text = escaped_text.replace(char, escaped)
+        st.warning(f"✏️ {len(pending)} unsaved change(s), saved automatically in a few seconds")
+        # Runs as a callback, so the fragment rerun that follows already shows the result
+        st.button("💾 Save feedback", key=key, on_click=self._flush_pending_feedback, args=(user_id,))
+    
+    def _show_pending_feedback_message(self):
+        """Toast the result of the last flush, once"""
+        message = st.session_state.pop('pending_feedback_message', None)
+        if message:
+            st.toast(message)
+    
+    def _flush_pending_feedback(self, user_id: str):
+        """Write the buffered changes; failed ones stay buffered for the next attempt, missing queries are dropped"""
+        pending = self._pending_feedback()
+        failed = self.firestore_query_service.batch_update(user_id, dict(pending))
+        deleted = False
+        for query_id, (action, _) in list(pending.items()):
+            if failed.get(query_id) != 'error':
+                deleted = deleted or action == 'delete'
+                del pending[query_id]
+        st.session_state.pop('pending_feedback_since', None)
         
-        return escaped_text
+        n_missing = sum(1 for reason in failed.values() if reason == 'missing')
+        n_errors = len(failed) - n_missing
+        if n_errors:
+            message = f"❌ Failed to save {n_errors} change(s), retrying shortly"
+        elif n_missing:
+            message = f"⚠️ Skipped {n_missing} change(s) to queries that no longer exist"
+        else:
+            message = "✅ Feedback saved!"
+        st.session_state.pending_feedback_message = message
+        if deleted:
+            # Full rerun so deleted queries leave the list
+            st.rerun()
+    
+    def _prefetch_visualizations(self, visualizations: List[Dict[str, Any]]):
+        """Start background downloads for HTML visualizations so View renders immediately"""
+        previous = st.session_state.get('viz_prefetch', {})
+        # Only the listed visualizations are kept, so downloads for older cards are let go
+        prefetch = {}
+        for viz in visualizations:
+            file_url = viz.get('file_url', '')
+            if file_url and not file_url.endswith(_IMAGE_EXTENSIONS):
+                prefetch[file_url] = previous.get(file_url) or _prefetch_pool.submit(_download_visualization_html, file_url)
+        st.session_state['viz_prefetch'] = prefetch
+    
+    def _prefetched_html(self, file_url: str) -> Optional[bytes]:
+        """Return the prefetched (gzipped) HTML if its download already finished, otherwise None"""
+        future = st.session_state.get('viz_prefetch', {}).get(file_url)
+        if future is None or not future.done():
+            return None
+        try:
+            return future.result(timeout=0)
+        except Exception:
+            return None
+    
+    def _open_ids(self) -> set:
+        """Keys of every expanded card, prefixed by card type, in a single session-state set"""
+        return st.session_state.setdefault('open_query_ids', set())
+    
+    def _toggle_view(self, view_key: str):
+        self._open_ids().symmetric_difference_update({view_key})
+    
+    def _escape_html(self, text: str) -> str:
+        return _html_escape(text, quote=True) if text else ""
     
     def _render_firestore_query_item(self, query: Dict[str, Any]):
+        """Normalize a Firestore query document and render it as a query card"""
+        query_id = query.get('id', 'unknown')
+        pending = self._pending_feedback()
+        
+        # Changes are buffered and written in one batch by _render_pending_feedback_controls
+        def on_feedback(is_helpful: bool) -> bool:
+            was_empty = not pending
+            pending[query_id] = ('helpful', is_helpful)
+            if was_empty:
+                # The save button lives outside the card fragment; rerun the app so it appears
+                st.rerun()
+            return True
+        
+        def on_delete() -> bool:
+            pending[query_id] = ('delete', None)
+            return True
+        
+        self._render_query_card(
+            item_id=query_id,
+            timestamp_str=self._format_timestamp(query.get('created_at', 'Unknown date')),
+            file_name=query.get('file_name', 'Unknown file'),
+            query_text=query.get('query', 'No query'),
+            response_text=query.get('response', ''),
+            on_feedback=on_feedback,
+            on_delete=on_delete
+        )
+    
+    def _format_timestamp(self, created_at: Any) -> str:
+        if hasattr(created_at, 'strftime'):
+            # It's a datetime object, format it
+            return created_at.strftime('%b %d %H:%M')
+        elif isinstance(created_at, str):
+            # It's already a string, use it as is
+            return created_at[:10] + ' ' + created_at[11:16] if len(created_at) > 16 else created_at
+        # Fallback
+        return 'Unknown date'
+    
+    @st.fragment
+    def _render_query_card(self, *, item_id: str, timestamp_str: str, file_name: str, query_text: str,
+                           response_text: str, on_feedback: Callable[[bool], bool], on_delete: Callable[[], bool]):
+        """Render a single query history card with collapsible response"""
         with st.container():
-            # Header with timestamp and query
-            # Format the created_at timestamp properly
-            created_at = query.get('created_at', 'Unknown date')
-            if hasattr(created_at, 'strftime'):
-                # It's a datetime object, format it
-                formatted_date = created_at.strftime('%b %d %H:%M')
-            elif isinstance(created_at, str):
-                # It's already a string, use it as is
-                formatted_date = created_at[:10] + ' ' + created_at[11:16] if len(created_at) > 16 else created_at
-            else:
-                # Fallback
-                formatted_date = 'Unknown date'
-            
-            st.markdown(f"""
-            <div style="border: 1px solid #ddd; border-radius: 5px; padding: 10px; margin: 5px 0; background-color: #f9f9f9;">
-                <div style="color: #1f4e79; font-weight: 600; margin-bottom: 0.5rem;">
-                    📅 {formatted_date}
-                </div>
-                <div style="color: #333; margin-bottom: 0.3rem;">
-                    <strong>📁 File:</strong> {query.get('file_name', 'Unknown file')}
-                </div>
-                <div style="color: #333; line-height: 1.4;">
-                    <strong>❓ Query:</strong> {query.get('query', 'No query')[:60]}{'...' if len(query.get('query', '')) > 60 else ''}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(
+                f'<div class="qcard"><div class="qdate">📅 {timestamp_str}</div>'
+                f'<div class="qfile"><strong>📁 File:</strong> {file_name}</div>'
+                f'<div class="qline"><strong>❓ Query:</strong> '
+                f"{query_text[:60]}{'...' if len(query_text) > 60 else ''}</div></div>",
+                unsafe_allow_html=True
+            )
             
             # Check current view state
-            view_key = f"view_response_{query.get('id', 'unknown')}"
-            is_viewing = st.session_state.get(view_key, False)
+            view_key = f"query:{item_id}"
+            is_viewing = view_key in self._open_ids()
             
             # Action buttons (matching visualization history format)
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 # Dynamic button text based on current state
                 button_text = "🙈 Hide" if is_viewing else "👁️ View"
-                if st.button(button_text, key=f"view_{query.get('id', 'unknown')}"):
-                    # Toggle view state
-                    st.session_state[view_key] = not is_viewing
-                    st.rerun()
+                # Toggled in a callback so only this card's fragment needs to redraw
+                st.button(button_text, key=f"view_{item_id}",
+                          on_click=self._toggle_view, args=(view_key,))
             
             with col2:
-                if st.button("👍", key=f"thumbs_up_{query.get('id', 'unknown')}"):
-                    # Update query helpfulness in database
-                    user_id = st.session_state.get('user', {}).get('uid')
-                    if user_id and self.firestore_query_service.update_query_helpfulness(user_id, query.get('id'), True):
+                if st.button("👍", key=f"thumbs_up_{item_id}"):
+                    if on_feedback(True):
                         st.success("Marked as helpful!")
-                        st.rerun()
                     else:
                         st.error("Failed to update feedback")
             
             with col3:
-                if st.button("👎", key=f"thumbs_down_{query.get('id', 'unknown')}"):
-                    # Update query helpfulness in database
-                    user_id = st.session_state.get('user', {}).get('uid')
-                    if user_id and self.firestore_query_service.update_query_helpfulness(user_id, query.get('id'), False):
+                if st.button("👎", key=f"thumbs_down_{item_id}"):
+                    if on_feedback(False):
                         st.success("Marked as not helpful!")
-                        st.rerun()
                     else:
                         st.error("Failed to update feedback")
             
             with col4:
-                if st.button("🗑️", key=f"delete_{query.get('id', 'unknown')}"):
-                    # Delete query from database
-                    user_id = st.session_state.get('user', {}).get('uid')
-                    if user_id and self.firestore_query_service.delete_query(user_id, query.get('id')):
+                if st.button("🗑️", key=f"delete_{item_id}"):
+                    if on_delete():
                         st.success("Query deleted!")
                         st.rerun()
                     else:
@@ -481,6 +557,6 @@ class HistoryComponent:
             if is_viewing:
                 st.markdown("**🤖 Response:**")
                 # Escape HTML characters in the response to prevent rendering issues
-                escaped_response = self._escape_html(query.get('response', ''))
+                escaped_response = self._escape_html(response_text)
                 st.markdown(escaped_response)
                 st.markdown("---")
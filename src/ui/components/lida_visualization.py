@@ -1,23 +1,167 @@
 import streamlit as st
 import pandas as pd
-from typing import Dict, Any, Optional
-import streamlit.components.v1 as components
+import html
+import io
+import string
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import plotly.graph_objects as go
 import plotly.express as px
-import io
-import base64
 from src.services.lida_visualization_service import LidaVisualizationService
 from src.services.firebase_storage_service import FirebaseStorageService
 from src.services.visualization_service import VisualizationService
+from src.services.firebase_config import FirebaseConfig
 from src.models.file_models import ProcessedFile
 
+# Chart image rendering (Kaleido) and storage uploads run here, off the script thread
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="chart-upload")
+
+# Upper bound on figures kept in st.session_state['_fig_cache']
+FIG_CACHE_SIZE = 32
+
+# Most recent LIDA results kept in st.session_state['generated_visualizations']
+GENERATED_HISTORY_SIZE = 10
+
+# A repeat of the same request within this many seconds reuses the last result (double-clicks)
+GENERATE_DEBOUNCE_SECONDS = 2.0
+
+# Larger datasets are sampled down to this many rows for on-screen charts unless the user opts out
+PREVIEW_MAX_ROWS = 50_000
+
+# Trace types that stay small and crisp as SVG; anything else is exported as WebP
+_VECTOR_TRACE_TYPES = {'bar', 'scatter', 'pie', 'histogram', 'box'}
+# Above this many plotted points an SVG gets larger than the raster equivalent
+_SVG_MAX_POINTS = 5000
+
+
+def _processed_file_key(processed_file: ProcessedFile) -> str:
+    file_info = processed_file.file_info
+    return file_info.content_hash or f"{file_info.name}:{file_info.upload_time.isoformat()}"
+
+
+@st.cache_resource(show_spinner=False, max_entries=8, hash_funcs={ProcessedFile: _processed_file_key})
+def _df_from_processed(processed_file: ProcessedFile) -> pd.DataFrame:
+    """Build a file's DataFrame once, keyed on its content hash rather than the raw records.
+    
+    Shared across reruns and sessions without the copy st.cache_data makes; callers must not mutate it,
+    so anything that runs generated code gets a .copy() instead.
+    """
+    data_json = processed_file.data_json
+    if isinstance(data_json, dict):
+        # Columnar {column: values} data maps straight onto pandas columns without per-row inference
+        return pd.DataFrame(data_json, copy=False)
+    return pd.DataFrame(data_json)
+
+
+class _UncachedResult(Exception):
+    """Raised out of _lida_generate so st.cache_data doesn't keep failed or fallback results"""
+    
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get("error", ""))
+        self.result = result
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _lida_generate(session_id: str, file_keys: Tuple[str, ...], prompt: str, _svc: LidaVisualizationService,
+                   _dataframes: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """Run LIDA for a prompt, cached per (session, file fingerprints, prompt); the service and frames aren't hashed.
+    
+    Keyed on the session so one user's charts are never served to another who uploads the same data.
+    """
+    result = _svc.generate_visualization_from_prompt(dataframes=_dataframes, user_prompt=prompt)
+    if not result.get("success") or result.get("method") != "lida":
+        raise _UncachedResult(result)
+    return result
+
+
+def _as_df(processed_file: ProcessedFile) -> pd.DataFrame:
+    """Return the file's DataFrame, memoized on the ProcessedFile instance"""
+    df = getattr(processed_file, '_df', None)
+    if df is None:
+        df = _df_from_processed(processed_file)
+        processed_file._df = df
+    return df
+
+
+# HTML summary stored when a chart has no renderable figure; values are escaped before substitution
+_CHART_HTML_TEMPLATE = string.Template("""
+<html>
+<head><title>${title}</title></head>
+<body>
+    <h2>${title}</h2>
+    <p><strong>Description:</strong> ${description}</p>
+    <p><strong>Prompt:</strong> ${prompt}</p>
+    <h3>Code:</h3>
+    <pre><code>${code}</code></pre>
+    <p><em>Generated by DataSierra LIDA</em></p>
+</body>
+</html>
+""")
+
+
+def _chart_export_format(fig) -> str:
+    """Pick the image format to store a chart in: SVG for small vector-friendly charts, else WebP"""
+    points = 0
+    for trace in fig.data:
+        if trace.type not in _VECTOR_TRACE_TYPES:
+            return 'webp'
+        values = getattr(trace, 'x', None)
+        if values is None:
+            values = getattr(trace, 'values', None)
+        points += len(values) if values is not None else 0
+    return 'svg' if points <= _SVG_MAX_POINTS else 'webp'
+
+
+def _preview_df(processed_file: ProcessedFile) -> pd.DataFrame:
+    """Return a fixed random sample of at most PREVIEW_MAX_ROWS rows, memoized like _as_df"""
+    df = getattr(processed_file, '_preview', None)
+    if df is None:
+        df = _as_df(processed_file)
+        if len(df) > PREVIEW_MAX_ROWS:
+            df = df.sample(n=PREVIEW_MAX_ROWS, random_state=0)
+        processed_file._preview = df
+    return df
+
+
+@lru_cache(maxsize=128)
+def _compile_chart(code: str):
+    """Compile generated chart code once; reruns re-exec the same snippets"""
+    return compile(code, '<lida-chart>', 'exec')
+
+
+@st.cache_resource(show_spinner=False)
+def _lida_service() -> LidaVisualizationService:
+    return LidaVisualizationService()
+
+
+@st.cache_resource(show_spinner=False)
+def _storage_service() -> FirebaseStorageService:
+    return FirebaseStorageService()
+
+
+@st.cache_resource(show_spinner=False)
+def _visualization_service() -> VisualizationService:
+    # The service captures the Firestore client when constructed, so bring Firebase up first
+    FirebaseConfig.initialize()
+    return VisualizationService()
+
+
 class LidaVisualizationComponent:
     def __init__(self):
-        self.lida_service = LidaVisualizationService()
-        self.storage_service = FirebaseStorageService()
-        self.viz_service = VisualizationService()
+        # Shared across reruns and sessions instead of rebuilt with every MainPage
+        self.lida_service = _lida_service()
+        self.storage_service = _storage_service()
+        self.viz_service = _visualization_service()
+        if self.viz_service.db is None:
+            # Firestore wasn't reachable; don't keep the client-less service for the whole process
+            _visualization_service.clear()
     
     def render(self, processed_files: Dict[str, ProcessedFile]):
+        self._report_pending_uploads()
+        
         if not processed_files:
             st.warning("⚠️ Please upload and process a data file first to generate visualizations.")
             return
@@ -49,15 +193,32 @@ class LidaVisualizationComponent:
                 st.error("Please enter a description for your visualization.")
                 return
             
-            with st.spinner("🤖 Generating your visualization..."):
-                try:
-                    result = self._generate_visualization(processed_files, user_prompt)
-                    if result["success"]:
-                        self._display_visualization(result, user_prompt, processed_files)
-                    else:
-                        st.error(f"❌ {result['error']}")
-                except Exception as e:
-                    st.error(f"❌ Error generating visualization: {str(e)}")
+            req_key = hash((user_prompt, tuple(processed_files.keys())))
+            is_repeat = (
+                st.session_state.get('_last_req_key') == req_key
+                and time.monotonic() - st.session_state.get('_last_req_t', 0) < GENERATE_DEBOUNCE_SECONDS
+                and 'lida_last_result' in st.session_state
+            )
+            
+            if not is_repeat:
+                # Replaced below on success; a failed attempt shouldn't leave the old charts up
+                st.session_state.pop('lida_last_result', None)
+                with st.spinner("🤖 Generating your visualization..."):
+                    try:
+                        result = self._generate_visualization(processed_files, user_prompt)
+                        if result["success"]:
+                            st.session_state.lida_last_result = {"result": result, "prompt": user_prompt}
+                            st.session_state._last_req_key = req_key
+                            st.session_state._last_req_t = time.monotonic()
+                        else:
+                            st.error(f"❌ {result['error']}")
+                    except Exception as e:
+                        st.error(f"❌ Error generating visualization: {str(e)}")
+        
+        # Keep showing the latest result on later reruns so its buttons keep working
+        last_result = st.session_state.get('lida_last_result')
+        if last_result:
+            self._display_visualization(last_result["result"], last_result["prompt"], processed_files)
     
     def _generate_visualization(self, processed_files: Dict[str, ProcessedFile], user_prompt: str) -> Dict[str, Any]:
         try:
@@ -69,28 +230,30 @@ class LidaVisualizationComponent:
             
             dataframes = {}
             for file_name, processed_file in processed_files.items():
-                # Convert the data_json back to a DataFrame
-                import pandas as pd
-                dataframes[file_name] = pd.DataFrame(processed_file.data_json)
+                # Copy the cached frame: LIDA runs its generated code against it
+                dataframes[file_name] = _as_df(processed_file).copy()
             
-            result = self.lida_service.generate_visualization_from_prompt(
-                dataframes=dataframes,
-                user_prompt=user_prompt
-            )
+            file_keys = tuple(_processed_file_key(processed_file) for processed_file in processed_files.values())
+            try:
+                result = _lida_generate(st.session_state.get('session_id', 'default'), file_keys, user_prompt,
+                                        self.lida_service, dataframes)
+            except _UncachedResult as uncached:
+                result = uncached.result
             
             if result["success"]:
                 visualization_data = {
+                    "id": uuid.uuid4().hex,
                     "prompt": user_prompt,
                     "charts": result["charts"],
                     "timestamp": pd.Timestamp.now(),
-                    "file_used": list(processed_files.keys())[0] if processed_files else "Unknown"
+                    "file_used": next(iter(processed_files), "Unknown")
                 }
                 
-                if "generated_visualizations" not in st.session_state:
-                    st.session_state.generated_visualizations = []
-                
-                st.session_state.generated_visualizations.append(visualization_data)
-                st.session_state.generated_visualizations = st.session_state.generated_visualizations[-10:]
+                # Keyed by id so a result can be dropped without shifting the others; insertion order is age
+                generated = st.session_state.setdefault("generated_visualizations", {})
+                generated[visualization_data["id"]] = visualization_data
+                if len(generated) > GENERATED_HISTORY_SIZE:
+                    del generated[next(iter(generated))]
             
             return result
             
@@ -108,47 +271,75 @@ class LidaVisualizationComponent:
             st.warning("No charts were generated. Try a different prompt.")
             return
         
+        if not processed_files:
+            st.error("No data available for visualization.")
+            return
+        
+        # Build the chart execution context once from the first file's data;
+        # each chart gets its own copy of the frame (see below)
+        file_name, processed_file = next(iter(processed_files.items()))
+        data = _as_df(processed_file)
+        
+        render_full = True
+        if len(data) > PREVIEW_MAX_ROWS:
+            render_full = st.checkbox(
+                f"Render full dataset ({len(data):,} rows)",
+                key="lida_render_full",
+                help="Charts use a random sample by default; plotting every row can be slow in the browser"
+            )
+            if not render_full:
+                st.caption(f"Charts show a random sample of {PREVIEW_MAX_ROWS:,} rows.")
+                data = _preview_df(processed_file)
+        
+        base_globals = {
+            "pd": pd,
+            "px": px,
+            "go": go,
+            "data": data,
+            "plt": None
+        }
+        
+        # Figures from previous runs, keyed by (code hash, data fingerprint)
+        fig_cache = st.session_state.setdefault('_fig_cache', {})
+        file_key = (_processed_file_key(processed_file), render_full)
+        
+        # Rendered charts, used by "Save all"
+        save_jobs = []
+        
         for i, chart in enumerate(charts):
             with st.expander(f"📊 Visualization {i+1}: {chart.get('title', 'Generated Chart')}", expanded=True):
                 st.markdown(f"**Description:** {chart.get('description', 'No description available')}")
                 
+                fig = None
                 try:
                     if chart.get('code'):
-                        # Get the data from the first processed file
-                        if not processed_files:
-                            st.error("No data available for visualization.")
-                            return
-                        
-                        # Convert the first file's data to DataFrame
-                        file_name, processed_file = next(iter(processed_files.items()))
-                        data = pd.DataFrame(processed_file.data_json)
-                        
-                        # Set up execution context with all necessary imports and data
-                        exec_globals = {
-                            "pd": pd, 
-                            "px": px, 
-                            "go": go,
-                            "data": data,
-                            "plt": None
-                        }
-                        exec_locals = {}
+                        cache_key = (hash(chart['code']), file_key)
+                        fig = fig_cache.get(cache_key)
                         
-                        # Execute the chart code
-                        exec(chart['code'], exec_globals, exec_locals)
-                        
-                        # Try to find the figure in different possible variable names
-                        fig = None
-                        for var_name in ['fig', 'chart', 'figure']:
-                            if var_name in exec_locals:
-                                fig = exec_locals[var_name]
-                                break
+                        if fig is None:
+                            exec_locals = {}
+                            
+                            # Execute the chart code on a private copy: `data` is the cached frame shared
+                            # by every chart and session, and generated code may modify it in place
+                            exec_globals = dict(base_globals, data=data.copy())
+                            exec(_compile_chart(chart['code']), exec_globals, exec_locals)
+                            
+                            # Try to find the figure in different possible variable names
+                            for var_name in ['fig', 'chart', 'figure']:
+                                if var_name in exec_locals:
+                                    fig = exec_locals[var_name]
+                                    break
+                            
+                            if fig is not None:
+                                fig_cache[cache_key] = fig
+                                if len(fig_cache) > FIG_CACHE_SIZE:
+                                    # Drop the oldest entry
+                                    fig_cache.pop(next(iter(fig_cache)))
                         
                         if fig is not None:
-                            # Display the chart
+                            # Display the chart; the image is only rendered if the user saves it
                             st.plotly_chart(fig, use_container_width=True)
-                            
-                            # Generate chart image and save to Firebase
-                            self._save_chart_to_firebase(fig, chart, user_prompt, i)
+                            save_jobs.append((fig, chart, i))
                         else:
                             st.code(chart['code'], language='python')
                             st.info("Chart code generated but couldn't find the figure. Check the code above.")
@@ -166,69 +357,102 @@ class LidaVisualizationComponent:
                 
                 with col2:
                     if st.button(f"💾 Save to History {i+1}", key=f"save_{i}"):
-                        # Re-save this specific chart to Firebase
-                        self._save_chart_to_firebase(None, chart, user_prompt, i)
+                        # fig comes from _fig_cache on reruns; None falls back to an HTML summary
+                        self._save_chart_to_firebase(fig, chart, user_prompt, i)
+        
+        if len(save_jobs) > 1:
+            if st.button("💾 Save all to History", key="save_all_charts"):
+                self._save_charts_to_firebase(save_jobs, user_prompt)
     
     def _save_chart_to_firebase(self, fig, chart: Dict[str, Any], user_prompt: str, chart_index: int):
-        """Save a chart image to Firebase Storage and metadata to Firestore"""
+        """Queue a chart to be rendered and saved to Firebase in the background"""
+        self._save_charts_to_firebase([(fig, chart, chart_index)], user_prompt)
+    
+    def _save_charts_to_firebase(self, jobs: List[Tuple[Any, Dict[str, Any], int]], user_prompt: str):
+        """Fan out (fig, chart, index) save jobs so their renders and uploads run concurrently"""
+        # Session state isn't available on worker threads, so resolve the user here
+        user_id = st.session_state.get('user', {}).get('uid')
+        if not user_id:
+            st.warning("Please log in to save visualizations")
+            return
+        
+        pending = st.session_state.setdefault('pending_uploads', [])
+        for fig, chart, chart_index in jobs:
+            pending.append(_IO_POOL.submit(self._upload_chart, fig, chart, user_prompt, chart_index, user_id))
+        
+        titles = ", ".join(chart.get('title', 'Generated Chart') for _, chart, _ in jobs)
+        st.info(f"⏳ Saving {len(jobs)} chart(s): {titles}")
+    
+    def _report_pending_uploads(self):
+        """Show the outcome of background chart saves that finished since the last run"""
+        pending = st.session_state.get('pending_uploads')
+        if not pending:
+            return
+        
+        still_running = []
+        for future in pending:
+            if not future.done():
+                still_running.append(future)
+                continue
+            try:
+                ok, message = future.result()
+            except Exception as e:
+                ok, message = False, f"❌ Error saving chart: {str(e)}"
+            if ok:
+                st.success(message)
+            else:
+                st.error(message)
+        st.session_state.pending_uploads = still_running
+    
+    def _upload_chart(self, fig, chart: Dict[str, Any], user_prompt: str, chart_index: int, user_id: str) -> Tuple[bool, str]:
+        """Render and upload a chart, then record it in Firestore. Runs on _IO_POOL."""
         try:
-            # Get current user
-            user_id = st.session_state.get('user', {}).get('uid')
-            if not user_id:
-                st.warning("Please log in to save visualizations")
-                return
-            
             # Generate filename
-            filename = f"{chart.get('title', 'chart').replace(' ', '_')}_{chart_index + 1}.png"
+            base_name = f"{chart.get('title', 'chart').replace(' ', '_')}_{chart_index + 1}"
             
             if fig is not None:
-                # Convert Plotly figure to PNG image
-                img_bytes = fig.to_image(format="png", width=800, height=600)
+                # WebP/SVG are much smaller than the equivalent PNG
+                image_format = _chart_export_format(fig)
+                image_buffer = io.BytesIO()
+                fig.write_image(image_buffer, format=image_format, width=800, height=600)
                 
-                # Upload image to Firebase Storage
-                upload_result = self.storage_service.upload_chart_image(
-                    image_data=img_bytes,
-                    filename=filename,
+                # Upload straight from the encoder's buffer
+                upload_result = self.storage_service.upload_chart_image_stream(
+                    image_stream=image_buffer,
+                    filename=f"{base_name}.{image_format}",
                     user_id=user_id,
-                    query=user_prompt
+                    query=user_prompt,
+                    content_type='image/svg+xml' if image_format == 'svg' else 'image/webp'
                 )
             else:
                 # If no figure available, create a simple HTML representation
-                html_content = f"""
-                <html>
-                <head><title>{chart.get('title', 'Generated Chart')}</title></head>
-                <body>
-                    <h2>{chart.get('title', 'Generated Chart')}</h2>
-                    <p><strong>Description:</strong> {chart.get('description', 'No description available')}</p>
-                    <p><strong>Prompt:</strong> {user_prompt}</p>
-                    <h3>Code:</h3>
-                    <pre><code>{chart.get('code', 'No code available')}</code></pre>
-                    <p><em>Generated by DataSierra LIDA</em></p>
-                </body>
-                </html>
-                """
+                html_content = _CHART_HTML_TEMPLATE.substitute(
+                    title=html.escape(chart.get('title', 'Generated Chart')),
+                    description=html.escape(chart.get('description', 'No description available')),
+                    prompt=html.escape(user_prompt),
+                    code=html.escape(chart.get('code', 'No code available'))
+                )
                 
                 # Upload HTML to Firebase Storage
                 upload_result = self.storage_service.upload_visualization(
                     file_data=html_content.encode('utf-8'),
-                    filename=filename.replace('.png', '.html'),
+                    filename=f"{base_name}.html",
                     user_id=user_id,
                     query=user_prompt,
                     content_type='text/html'
                 )
             
-            if upload_result:
-                # Save to Firestore
-                viz_id = self.viz_service.save_visualization(user_id, upload_result)
-                if viz_id:
-                    st.success(f"✅ Chart saved: {chart.get('title', 'Generated Chart')}")
-                else:
-                    st.error("❌ Failed to save chart to database")
-            else:
-                st.error("❌ Failed to upload chart to storage")
+            if not upload_result:
+                return False, "❌ Failed to upload chart to storage"
+            
+            # Save to Firestore
+            viz_id = self.viz_service.save_visualization(user_id, upload_result)
+            if viz_id:
+                return True, f"✅ Chart saved: {chart.get('title', 'Generated Chart')}"
+            return False, "❌ Failed to save chart to database"
                 
         except Exception as e:
-            st.error(f"❌ Error saving chart: {str(e)}")
+            return False, f"❌ Error saving chart: {str(e)}"
     
     # Previous visualizations are now handled by the history component
     # which pulls data from Firebase instead of local storage
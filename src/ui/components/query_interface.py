@@ -1,12 +1,50 @@
 # Query interface component
 
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from html import escape as _html_escape
+
 import streamlit as st
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 
 from ...models.file_models import ProcessedFile
 from ...models.query_models import QueryRequest, QueryResponse
 from ...services.ai_service import AIService
 from ...services.data_service import DataService
+from ...utils.styling import batched_markdown
+
+
+# LLM round-trips run here so the rest of the page renders while the answer is pending
+_QUERY_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ai-query")
+
+# How often (seconds) the pending-answer fragment checks whether the answer is ready
+QUERY_POLL_INTERVAL = 0.5
+
+
+# Answers kept per browser session in st.session_state['_query_cache'] (most recent last)
+QUERY_CACHE_SIZE = 32
+# Cached answers older than this many seconds are asked again
+QUERY_CACHE_TTL = 30 * 60
+
+
+def _run_ai_query(ai_service: AIService, request: QueryRequest, processed_files: Dict[str, ProcessedFile],
+                  on_token: Optional[Callable[[str], None]] = None) -> QueryResponse:
+    """Answer a question on a _QUERY_POOL thread; touches no Streamlit state"""
+    return ai_service.process_query(request, processed_files, on_token=on_token)
+
+
+def clear_query_cache():
+    """Forget this session's cached answers, e.g. when the user logs out"""
+    st.session_state.pop('_query_cache', None)
+
+
+def _file_fingerprint(processed_files: Dict[str, ProcessedFile], file_name: str) -> str:
+    processed_file = processed_files.get(file_name)
+    if processed_file is None:
+        return ""
+    file_info = processed_file.file_info
+    return file_info.content_hash or f"{file_info.name}:{file_info.upload_time.isoformat()}"
 
 
 class QueryInterfaceComponent:
@@ -33,9 +71,10 @@ class QueryInterfaceComponent:
             label_visibility="collapsed"
         )
         
-        # Query input
+        # Query input; the form holds typing back until a button is pressed
         default_query = st.session_state.get('example_query', '') or st.session_state.get('pending_rerun_query', '')
-        query = st.text_area(
+        query_form = st.form("query_form", clear_on_submit=False, border=False)
+        query = query_form.text_area(
             "Ask your question:",
             height=100,
             placeholder="Enter your question about the data...",
@@ -53,63 +92,116 @@ class QueryInterfaceComponent:
             del st.session_state.example_query
 
         # Submit button
-        col1, col2, col3 = st.columns([1, 5.5, 1])
+        col1, col2, col3 = query_form.columns([1, 5.5, 1])
         with col1:
-            ask_button = st.button("Ask Sierra!", type="primary")
+            ask_button = st.form_submit_button("Ask Sierra!", type="primary")
         with col3:
-            clear_button = st.button("🗑️ Clear")
-        
-        if clear_button:
-            st.rerun()
-        
+            st.form_submit_button("🗑️ Clear", on_click=self._clear_query)
         
-        # Process query if submitted
+        # Submit the query in the background; the answer is shown once it is ready
         if ask_button and query.strip():
-            response = self._process_query(query, query_file, processed_files, session_id)
-            if response:
-                return {
-                    'response': response,
-                    'original_query': query,
-                    'file_name': query_file
-                }
+            self._submit_query(query, query_file, processed_files, session_id)
+        
+        pending = st.session_state.get('pending_query')
+        if pending:
+            if not pending['future'].done():
+                self._render_pending_query()
+                return None
+            del st.session_state.pending_query
+            response = self._process_query(pending['future'], pending['query'], pending['file_name'])
+            if response.success:
+                self._cache_response(pending['cache_key'], response)
+            return {
+                'response': response,
+                'original_query': pending['query'],
+                'file_name': pending['file_name']
+            }
         
         return None
     
+    def _clear_query(self):
+        """Empty the question box; runs as a callback, before the text area is drawn again"""
+        st.session_state.query_input = ""
     
-        for i, example in enumerate(examples):
-            with example_cols[i % 3]:
-                if st.button(f"💭 {example[:30]}...", key=f"example_{i}"):
-                    st.session_state.example_query = example
-                    st.rerun()
+    def _submit_query(self, query: str, query_file: str, processed_files: Dict[str, ProcessedFile], session_id: str):
+        """Start answering the query on a worker thread; a repeat of a question this session already asked on unchanged data is answered from the cache"""
+        # A second click while the same question is still running keeps waiting on the first request
+        pending = st.session_state.get('pending_query')
+        if pending and not pending['future'].done() and (pending['query'], pending['file_name']) == (query, query_file):
+            return
+        
+        # The cache lives in this session's state, so answers are never shared between users
+        cache_key = (query, query_file, _file_fingerprint(processed_files, query_file))
+        query_cache = st.session_state.setdefault('_query_cache', OrderedDict())
+        
+        partial_answer: List[str] = []
+        entry = query_cache.get(cache_key)
+        if entry is not None and time.monotonic() - entry[1] > QUERY_CACHE_TTL:
+            del query_cache[cache_key]
+            entry = None
+        
+        if entry is not None:
+            cached = entry[0]
+            query_cache.move_to_end(cache_key)
+            # Keep the follow-up context the same as if the model had been asked again
+            self.ai_service.record_cached_exchange(session_id, query, cached.answer or "", processed_files)
+            future = Future()
+            future.set_result(cached)
+        else:
+            # The worker appends answer pieces here as they stream in; the polling fragment shows them
+            request = QueryRequest(question=query, file_name=query_file, session_id=session_id)
+            future = _QUERY_POOL.submit(_run_ai_query, self.ai_service, request, processed_files, partial_answer.append)
+        
+        st.session_state.pending_query = {
+            'future': future,
+            'query': query,
+            'file_name': query_file,
+            'partial_answer': partial_answer,
+            'cache_key': cache_key
+        }
     
-    def _process_query(self, query: str, query_file: str, processed_files: Dict[str, ProcessedFile], session_id: str) -> QueryResponse:
-        """Process the user query"""
-        with st.spinner("🤖 AI is analyzing your data..."):
-            # Create query request
-            request = QueryRequest(
-                question=query,
-                file_name=query_file,
-                session_id=session_id
-            )
-            
-            # Process with AI service
-            response = self.ai_service.process_query(request, processed_files)
-            
-            if response.success:
-                self._display_successful_response(response, query, query_file)
-            else:
-                self._display_error_response(response)
-            
-            return response
+    @st.fragment(run_every=QUERY_POLL_INTERVAL)
+    def _render_pending_query(self):
+        """Show progress and the answer streamed so far, then rerun the page to display the full response"""
+        pending = st.session_state.get('pending_query')
+        if pending and pending['future'].done():
+            st.rerun()
+        st.info("🤖 AI is analyzing your data...")
+        if pending and pending['partial_answer']:
+            st.markdown(self._escape_html("".join(pending['partial_answer'])))
+    
+    def _cache_response(self, cache_key: tuple, response: QueryResponse):
+        """Remember a successful answer for this session, dropping the oldest beyond QUERY_CACHE_SIZE"""
+        query_cache = st.session_state.setdefault('_query_cache', OrderedDict())
+        query_cache[cache_key] = (response, time.monotonic())
+        query_cache.move_to_end(cache_key)
+        while len(query_cache) > QUERY_CACHE_SIZE:
+            query_cache.popitem(last=False)
+    
+    def _process_query(self, future: Future, query: str, query_file: str) -> QueryResponse:
+        """Collect the finished query's response and display it"""
+        try:
+            response = future.result()
+        except Exception as e:
+            response = QueryResponse(success=False, error=str(e), error_type="processing_error")
+        
+        if response.success:
+            self._display_successful_response(response, query, query_file)
+        else:
+            self._display_error_response(response)
+        
+        return response
     
     def _display_successful_response(self, response: QueryResponse, query: str, query_file: str):
         """Display successful AI response"""
-        st.markdown("### 🤖 DataSierra's Response")
-        st.markdown(f"**Query:** {query}")
-        st.markdown("**Response:**")
         # Escape HTML characters in the response to prevent rendering issues
         escaped_response = self._escape_html(response.answer)
-        st.markdown(escaped_response)
+        batched_markdown([
+            "### 🤖 DataSierra's Response",
+            f"**Query:** {query}",
+            "**Response:**",
+            escaped_response
+        ])
         
         # Display additional insights
         self._display_data_quality_insights(response.data_quality_insights)
@@ -238,8 +330,9 @@ class QueryInterfaceComponent:
             else:
                 st.info("💡 Try asking data-specific questions to enable PandasAI analysis")
     
+    @st.fragment
     def _display_feedback_section(self):
-        """Display feedback section"""
+        """Display feedback section; its buttons rerun only this fragment, so the response above stays put"""
         st.markdown("### 💬 Feedback")
         feedback_col1, feedback_col2, feedback_col3 = st.columns([1, 1, 2])
         
@@ -258,20 +351,4 @@ class QueryInterfaceComponent:
                     st.success("Comment submitted!")
     
     def _escape_html(self, text: str) -> str:
-        if not text:
-            return ""
-        
-        # Replace common HTML characters with their escaped equivalents
-        html_escape_table = {
-            "&": "&amp;",
-            '"': "&quot;",
-            "'": "&#x27;",
-            ">": "&gt;",
-            "<": "&lt;",
-        }
-        
-        escaped_text = text
-        for char, escaped in html_escape_table.items():
-            escaped_text = escaped_text.replace(char, escaped)
-        
-        return escaped_text
+        return _html_escape(text, quote=True) if text else ""
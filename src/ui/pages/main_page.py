@@ -1,5 +1,7 @@
 # Main page component
 
+import uuid
+
 import streamlit as st
 from typing import Dict, Any
 
@@ -18,15 +20,31 @@ from ..components.auth_modal import AuthModalComponent
 from ..components.lida_visualization import LidaVisualizationComponent
 
 
+@st.cache_resource(show_spinner=False)
+def _shared_services() -> Dict[str, Any]:
+    """Services without per-user state, built once per process and shared by every session"""
+    return {
+        'file': FileService(),
+        'data': DataService(),
+        'auth': AuthService(),
+    }
+
+
 class MainPage:
     
     def __init__(self):
         # Initialize services
-        self.file_service = FileService()
-        self.ai_service = AIService()
-        self.data_service = DataService()
-        self.session_service = SessionService()
-        self.auth_service = AuthService()
+        services = _shared_services()
+        self.file_service = services['file']
+        self.data_service = services['data']
+        self.auth_service = services['auth']
+        # AIService holds conversation memory and SessionService the user's history, so each session keeps its own
+        if 'ai_service' not in st.session_state:
+            st.session_state.ai_service = AIService()
+        if 'session_service' not in st.session_state:
+            st.session_state.session_service = SessionService()
+        self.ai_service = st.session_state.ai_service
+        self.session_service = st.session_state.session_service
         
         # Initialize UI components
         self.auth_modal_component = AuthModalComponent(self.auth_service)
@@ -96,7 +114,8 @@ class MainPage:
         if 'processed_files' not in st.session_state:
             st.session_state.processed_files = {}
         if 'session_id' not in st.session_state:
-            st.session_state.session_id = "default"
+            # Unique per browser session: keys this session's conversation memory
+            st.session_state.session_id = uuid.uuid4().hex
         if 'query_history' not in st.session_state:
             st.session_state.query_history = []
     
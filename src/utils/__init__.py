@@ -2,6 +2,6 @@
 Utility modules for DataSierra
 """
 
-from .styling import apply_custom_styling
+from .styling import apply_custom_styling, batched_markdown
 
-__all__ = ['apply_custom_styling']
+__all__ = ['apply_custom_styling', 'batched_markdown']
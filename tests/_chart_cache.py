@@ -0,0 +1,51 @@
+"""
+On-disk cache for the chart images rendered by the integration tests
+
+Kaleido renders the same figure to the same bytes, so images are stored per
+figure spec and export options and reused across runs. Set FORCE_RERENDER=1 to
+bypass it, e.g. when checking Kaleido itself.
+"""
+
+import hashlib
+import json
+import os
+from importlib import metadata
+from typing import Any
+
+from tests._upload_cache import CACHE_DIR
+
+
+CHARTS_DIR = CACHE_DIR / "charts"
+
+
+def _kaleido_version() -> str:
+    try:
+        return metadata.version("kaleido")
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def _cache_key(fig, kwargs) -> str:
+    digest = hashlib.sha256(f"{_kaleido_version()}|".encode("utf-8"))
+    digest.update(json.dumps(kwargs, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(fig.to_json().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cached_image(fig, **kwargs: Any) -> bytes:
+    """fig.to_image(**kwargs), read from disk when the same figure was rendered before"""
+    path = CHARTS_DIR / f"{_cache_key(fig, kwargs)}.{kwargs.get('format', 'img')}"
+    force = os.environ.get("FORCE_RERENDER") == "1"
+
+    if not force and path.exists():
+        return path.read_bytes()
+
+    img_bytes = fig.to_image(**kwargs)
+    if img_bytes:
+        CHARTS_DIR.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a parallel worker never reads a partial image
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(img_bytes)
+        tmp_path.replace(path)
+
+    return img_bytes
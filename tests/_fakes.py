@@ -0,0 +1,164 @@
+"""
+In-memory stand-ins for the network-backed services, used by `pytest --fast`
+"""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+from google.api_core import exceptions
+
+from src.services.firebase_storage_service import FirebaseStorageService
+from src.services.lida_visualization_service import LidaVisualizationService
+
+
+def fake_storage_service() -> MagicMock:
+    """FirebaseStorageService whose uploads succeed without touching Storage"""
+    def _result(data: bytes, filename: str, user_id: str, **kwargs) -> Dict[str, Any]:
+        return {
+            "file_url": f"fake://{user_id}/{filename}",
+            "storage_path": f"users/{user_id}/{filename}",
+            "original_filename": filename,
+            "file_size": len(data),
+            "content_type": kwargs.get("content_type", "application/octet-stream"),
+            "created_at": datetime.utcnow().isoformat(),
+            "query": kwargs.get("query"),
+            "user_id": user_id
+        }
+
+    storage = MagicMock(spec=FirebaseStorageService)
+    storage.upload_file.side_effect = lambda file_data, **kwargs: _result(file_data, **kwargs)
+    storage.upload_chart_image.side_effect = lambda image_data, **kwargs: _result(image_data, **kwargs)
+    return storage
+
+
+def fake_lida_service() -> MagicMock:
+    """LidaVisualizationService returning a canned chart instead of calling the LLM"""
+    lida = MagicMock(spec=LidaVisualizationService)
+    lida.is_available.return_value = True
+    lida.generate_visualization_from_prompt.return_value = {
+        "success": True,
+        "charts": [{
+            "title": "Canned chart",
+            "description": "Returned by the --fast LIDA stand-in",
+            "code": "",
+            "library": "plotly"
+        }],
+        "method": "fake"
+    }
+    return lida
+
+
+class FakeVisualizationService:
+    """VisualizationService backed by a dict instead of Firestore; batches are ignored"""
+
+    def __init__(self):
+        self._docs: Dict[str, Dict[str, Any]] = {}
+
+    def save_visualization(self, user_uid: str, viz_data: Dict[str, Any], batch: Optional[Any] = None) -> Optional[str]:
+        viz_id = uuid.uuid4().hex
+        self._docs[viz_id] = dict(
+            viz_data,
+            created_at=viz_data.get('created_at', datetime.utcnow().isoformat()),
+            helpfulness_updated_at=None,
+            is_helpful=None,
+            user_id=user_uid
+        )
+        return viz_id
+
+    def save_visualizations_batch(self, user_uid: str, viz_list: List[Dict[str, Any]]) -> List[str]:
+        return [self.save_visualization(user_uid, viz_data) for viz_data in viz_list]
+
+    def get_user_visualizations(self, user_uid: str, limit: int = 10, order_by: str = 'created_at') -> List[Dict[str, Any]]:
+        docs = [dict(doc, id=viz_id) for viz_id, doc in self._docs.items() if doc['user_id'] == user_uid]
+        docs.sort(key=lambda doc: doc.get(order_by) or '', reverse=True)
+        return docs[:limit]
+
+    def update_visualization_helpfulness(self, user_uid: str, viz_id: str, is_helpful: bool, batch: Optional[Any] = None) -> bool:
+        doc = self._docs.get(viz_id)
+        if doc is None or doc['user_id'] != user_uid:
+            return False
+        doc['is_helpful'] = is_helpful
+        doc['helpfulness_updated_at'] = datetime.utcnow().isoformat()
+        return True
+
+    def delete_visualization(self, user_uid: str, viz_id: str) -> bool:
+        return self._docs.pop(viz_id, None) is not None
+
+
+class FakeFirestore:
+    """Just enough of a Firestore client for the services' write paths; batches commit all-or-nothing"""
+
+    def __init__(self):
+        self.docs: Dict[tuple, Dict[str, Any]] = {}
+        # Number of writes in each committed batch, in commit order
+        self.commits: List[int] = []
+
+    def collection(self, name: str) -> "FakeCollection":
+        return FakeCollection(self, (name,))
+
+    def batch(self) -> "FakeBatch":
+        return FakeBatch(self)
+
+
+class FakeCollection:
+
+    def __init__(self, db: FakeFirestore, path: tuple):
+        self._db = db
+        self._path = path
+
+    def document(self, doc_id: Optional[str] = None) -> "FakeDocument":
+        return FakeDocument(self._db, self._path + (doc_id or uuid.uuid4().hex,))
+
+
+class FakeDocument:
+
+    def __init__(self, db: FakeFirestore, path: tuple):
+        self._db = db
+        self.path = path
+        self.id = path[-1]
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self._db, self.path + (name,))
+
+    def set(self, data: Dict[str, Any], merge: bool = False, retry: Optional[Any] = None):
+        batch = FakeBatch(self._db)
+        batch.set(self, data, merge=merge)
+        batch.commit()
+
+    def update(self, data: Dict[str, Any], retry: Optional[Any] = None):
+        batch = FakeBatch(self._db)
+        batch.update(self, data)
+        batch.commit()
+
+
+class FakeBatch:
+
+    def __init__(self, db: FakeFirestore):
+        self._db = db
+        self._ops = []
+
+    def set(self, doc_ref: FakeDocument, data: Dict[str, Any], merge: bool = False):
+        self._ops.append(('set', doc_ref.path, dict(data), merge))
+
+    def update(self, doc_ref: FakeDocument, data: Dict[str, Any]):
+        self._ops.append(('update', doc_ref.path, dict(data), True))
+
+    def delete(self, doc_ref: FakeDocument):
+        self._ops.append(('delete', doc_ref.path, None, False))
+
+    def commit(self, retry: Optional[Any] = None):
+        # Like Firestore, one update to a missing document fails the whole batch
+        for op, path, _, _ in self._ops:
+            if op == 'update' and path not in self._db.docs:
+                raise exceptions.NotFound(f"No document to update: {'/'.join(path)}")
+
+        for op, path, data, merge in self._ops:
+            if op == 'delete':
+                self._db.docs.pop(path, None)
+            elif merge:
+                self._db.docs.setdefault(path, {}).update(data)
+            else:
+                self._db.docs[path] = data
+        self._db.commits.append(len(self._ops))
@@ -0,0 +1,59 @@
+"""
+Disk cache for LIDA visualization results used by the integration tests
+
+A LIDA run is an LLM round trip, so results are kept per (prompt, data) and
+reused across runs. Only real LIDA results are stored; the local fallback is
+cheap to recompute. Delete tests/.cache/lida (or bump CACHE_VERSION) to reset.
+"""
+
+import hashlib
+from importlib import metadata
+from typing import Any, Dict
+
+import pandas as pd
+from diskcache import Cache
+
+from tests._upload_cache import CACHE_DIR
+
+
+# Bump when the prompt/model setup in LidaVisualizationService changes
+CACHE_VERSION = "1"
+
+_cache = None
+
+
+def _get_cache() -> Cache:
+    global _cache
+    if _cache is None:
+        _cache = Cache(str(CACHE_DIR / "lida"))
+    return _cache
+
+
+def _lida_version() -> str:
+    try:
+        return metadata.version("lida")
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def _cache_key(dataframes: Dict[str, pd.DataFrame], user_prompt: str) -> str:
+    digest = hashlib.sha256(f"{CACHE_VERSION}|{_lida_version()}|{user_prompt}".encode("utf-8"))
+    for name, df in dataframes.items():
+        digest.update(f"|{name}|".encode("utf-8"))
+        digest.update(df.to_csv(index=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def cached_generate(lida_service, dataframes: Dict[str, pd.DataFrame], user_prompt: str) -> Dict[str, Any]:
+    """generate_visualization_from_prompt, served from disk when this prompt and data were seen before"""
+    cache = _get_cache()
+    key = _cache_key(dataframes, user_prompt)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = lida_service.generate_visualization_from_prompt(dataframes=dataframes, user_prompt=user_prompt)
+    if result.get("success") and result.get("method") == "lida":
+        cache.set(key, result)
+    return result
@@ -0,0 +1,64 @@
+"""
+Local sidecar cache for Firebase Storage uploads made by the integration tests
+
+Uploading the same bytes again on every run only re-tests the network, so the
+upload result is remembered per content hash. Set FORCE_REUPLOAD=1 to bypass it.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from unittest.mock import Mock
+
+from filelock import FileLock
+
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+UPLOADS_PATH = CACHE_DIR / "uploads.json"
+
+
+def _cache_key(upload: Callable, content: bytes, kwargs: Dict[str, Any]) -> str:
+    """Hash the uploaded bytes together with the call that uploaded them"""
+    digest = hashlib.blake2b(content)
+    digest.update(getattr(upload, "__name__", "upload").encode("utf-8"))
+    digest.update(json.dumps(kwargs, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_entries() -> Dict[str, Any]:
+    try:
+        return json.loads(UPLOADS_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def cached_upload(upload: Callable[..., Optional[Dict[str, Any]]], content: bytes, **kwargs) -> Optional[Dict[str, Any]]:
+    """Call upload(content, **kwargs) unless the same content was already uploaded"""
+    # Fake uploads from `pytest --fast` have nothing worth remembering
+    if isinstance(upload, Mock):
+        return upload(content, **kwargs)
+
+    key = _cache_key(upload, content, kwargs)
+    force = os.environ.get("FORCE_REUPLOAD") == "1"
+
+    if not force:
+        cached = _read_entries().get(key)
+        if cached:
+            return dict(cached)
+
+    result = upload(content, **kwargs)
+    if not result:
+        return result
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    # xdist workers may finish uploads at the same time
+    with FileLock(str(UPLOADS_PATH) + ".lock"):
+        entries = _read_entries()
+        entries[key] = result
+        tmp_path = UPLOADS_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entries, indent=2, default=str), encoding="utf-8")
+        tmp_path.replace(UPLOADS_PATH)
+
+    return dict(result)
@@ -0,0 +1,270 @@
+"""
+Shared pytest fixtures for the DataSierra integration tests
+"""
+
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--fast",
+        action="store_true",
+        default=False,
+        help="replace Firebase Storage, Firestore visualizations and LIDA with in-memory fakes",
+    )
+
+
+@pytest.fixture(scope="session")
+def fast(request):
+    """Whether the run uses in-memory fakes instead of network services"""
+    return request.config.getoption("--fast")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def firebase(tmp_path_factory, fast):
+    """Initialize Firebase once per session; xdist workers take turns so credentials are fetched one at a time"""
+    from src.services.firebase_config import FirebaseConfig
+
+    if fast:
+        # Nothing talks to Firebase; FirebaseConfig.batch() yields None so writes apply directly
+        return FirebaseConfig
+
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        from filelock import FileLock
+
+        # Shared by every worker of this run (the base temp dir is per worker)
+        lock_path = tmp_path_factory.getbasetemp().parent / "firebase_init.lock"
+        with FileLock(str(lock_path)):
+            FirebaseConfig.initialize()
+    else:
+        FirebaseConfig.initialize()
+
+    return FirebaseConfig
+
+
+@pytest.fixture(autouse=True)
+def _require_firebase(request, firebase, fast):
+    """Skip tests marked firebase when Firebase couldn't be initialized"""
+    if request.node.get_closest_marker("firebase") and not fast and not firebase.is_initialized():
+        pytest.skip(f"Firebase initialization failed: {firebase.get_initialization_error()}")
+
+
+@pytest.fixture(scope="session")
+def services(firebase, fast):
+    """Build every service and UI component once per test session (once per worker under xdist)"""
+    from src.services.auth_service import AuthService
+    from src.services.file_service import FileService
+    from src.services.ai_service import AIService
+    from src.services.data_service import DataService
+    from src.services.session_service import SessionService
+    from src.services.firebase_storage_service import FirebaseStorageService
+    from src.services.visualization_service import VisualizationService
+    from src.services.lida_visualization_service import LidaVisualizationService
+    from src.ui.components.auth_modal import AuthModalComponent
+    from src.ui.components.file_upload import FileUploadComponent
+    from src.ui.components.query_interface import QueryInterfaceComponent
+    from src.ui.components.history import HistoryComponent
+    from src.ui.components.lida_visualization import LidaVisualizationComponent
+
+    auth_service = AuthService()
+    file_service = FileService()
+    ai_service = AIService()
+    data_service = DataService()
+    session_service = SessionService()
+    auth_modal = AuthModalComponent(auth_service)
+
+    if fast:
+        from tests._fakes import fake_storage_service, fake_lida_service, FakeVisualizationService
+
+        storage_service = fake_storage_service()
+        viz_service = FakeVisualizationService()
+        lida_service = fake_lida_service()
+    else:
+        storage_service = FirebaseStorageService()
+        viz_service = VisualizationService(db=firebase.get_firestore_client())
+        lida_service = LidaVisualizationService()
+
+    namespace = SimpleNamespace(
+        auth=auth_service,
+        file=file_service,
+        ai=ai_service,
+        data=data_service,
+        session=session_service,
+        storage=storage_service,
+        viz=viz_service,
+        lida=lida_service,
+        auth_modal=auth_modal,
+        file_upload=FileUploadComponent(file_service, auth_modal),
+        query_interface=QueryInterfaceComponent(ai_service, data_service),
+        history=HistoryComponent(session_service),
+        lida_visualization=LidaVisualizationComponent(),
+    )
+    # Attribute names per service, collected once for the tests' API checks
+    namespace.methods = {name: frozenset(dir(obj)) for name, obj in vars(namespace).items()}
+    return namespace
+
+
+@pytest.fixture
+def fake_firestore():
+    """Empty in-memory Firestore client for testing the services' write paths without Firebase"""
+    from tests._fakes import FakeFirestore
+
+    return FakeFirestore()
+
+
+@pytest.fixture(scope="session")
+def warm_kaleido():
+    """Keep one Kaleido browser running for the session so to_image() doesn't pay Chrome startup each call"""
+    kaleido = pytest.importorskip("kaleido")
+    import plotly.io as pio
+
+    # The shared server needs Kaleido 1.x and pio.defaults needs plotly 6.1+ (see requirements-dev.txt)
+    if not hasattr(kaleido, "start_sync_server") or not hasattr(pio, "defaults"):
+        pytest.skip("Chart tests need kaleido>=1.0 and plotly>=6.1")
+
+    # WebP, like the app's chart uploads: smaller and cheaper to encode than PNG
+    pio.defaults.default_format = "webp"
+    # The test charts have no LaTeX, so skip loading MathJax into the renderer
+    pio.defaults.mathjax = None
+
+    # Probe with a one-off render before starting the server thread, which hangs
+    # rather than failing when Chrome is missing; skip the chart tests in that case
+    try:
+        pio.to_image({'data': [{'type': 'bar', 'x': [1], 'y': [1]}]}, width=10, height=10)
+    except Exception as e:
+        pytest.skip(f"Kaleido cannot render images (run `plotly_get_chrome` to install Chrome): {e}")
+
+    kaleido.start_sync_server(silence_warnings=True)
+    yield
+    kaleido.stop_sync_server(silence_warnings=True)
+
+
+@pytest.fixture(scope="session")
+def chart_images(sample_df, warm_kaleido):
+    """WebP renders of the sample charts, built once per sample size and shared by the visualization tests"""
+    import plotly.express as px
+
+    from tests._chart_cache import cached_image
+
+    salary_by_department = sample_df.groupby('Department')['Salary'].mean().reset_index()
+    figures = {
+        "salary_by_department.webp": px.bar(salary_by_department, x='Department', y='Salary',
+                                            title='Average Salary by Department'),
+        "age_by_department.webp": px.box(sample_df, x='Department', y='Age',
+                                         title='Age by Department'),
+        "salary_vs_age.webp": px.scatter(sample_df, x='Age', y='Salary',
+                                         title='Salary vs Age'),
+    }
+    return {filename: cached_image(fig, format="webp", width=800, height=600) for filename, fig in figures.items()}
+
+
+class MockSessionState(dict):
+    """Stand-in for st.session_state when Streamlit doesn't provide one"""
+
+
+@pytest.fixture(scope="session")
+def session_state():
+    """Streamlit session state, mocked once per session if it isn't available"""
+    import streamlit as st
+
+    if not hasattr(st, 'session_state'):
+        st.session_state = MockSessionState()
+    return st.session_state
+
+
+@pytest.fixture(scope="session")
+def test_user(session_state):
+    """Simulated locally authenticated user, stored in session state like the auth modal does"""
+    user = {
+        'uid': 'test_user_integration',
+        'email': 'test@datasierra.com',
+        'display_name': 'Test User'
+    }
+    session_state['user'] = user
+    return user
+
+
+# Row counts for the sample dataset; xdist can hand each size to a different worker
+SAMPLE_SIZES = [
+    pytest.param(5, id="small"),
+    pytest.param(10_000, id="medium"),
+    pytest.param(1_000_000, id="large", marks=pytest.mark.slow),
+]
+
+
+@pytest.fixture(scope="session", params=SAMPLE_SIZES)
+def sample_df(request):
+    """Employee dataset shared by the upload, query and visualization tests, at each sample size"""
+    df = pd.DataFrame({
+        'Name': ['Alice', 'Bob', 'Charlie', 'Diana', 'Eve'],
+        'Age': [25, 30, 35, 28, 32],
+        'Salary': [50000, 60000, 70000, 55000, 65000],
+        'Department': ['IT', 'HR', 'IT', 'Finance', 'IT']
+    })
+    n_rows = request.param
+    if n_rows == len(df):
+        return df
+    # Larger sizes repeat the base rows
+    return df.iloc[np.arange(n_rows) % len(df)].reset_index(drop=True)
+
+
+@pytest.fixture(scope="session")
+def csv_bytes(sample_df):
+    """sample_df serialized to CSV once, as it would be uploaded"""
+    return sample_df.to_csv(index=False).encode('utf-8')
+
+
+@pytest.fixture(scope="session")
+def sample_processed_file(sample_df, csv_bytes):
+    """ProcessedFile for sample_df, laid out the way FileService builds one"""
+    from src.models.file_models import ProcessedFile, FileInfo, DataQuality
+
+    df = sample_df
+    # Dtype names per column, shared by the file info and column statistics
+    dtype_map = df.dtypes.astype(str).to_dict()
+    file_info = FileInfo(
+        name="test_dataset.csv",
+        size=len(csv_bytes),
+        type="csv",
+        upload_time=datetime.now(),
+        shape=df.shape,
+        columns=list(df.columns),
+        dtypes=dtype_map
+    )
+
+    # Scan for nulls and duplicates once and reuse the counts below
+    null_mask = df.isnull()
+    n_nulls = int(null_mask.values.sum())
+    n_dupes = int(df.duplicated().sum())
+
+    data_quality = DataQuality(
+        total_nulls=n_nulls,
+        duplicate_rows=n_dupes,
+        completeness_score=1.0 - (n_nulls / df.size),
+        uniqueness_score=1.0 - (n_dupes / len(df))
+    )
+
+    null_counts = null_mask.sum(axis=0)
+    unique_counts = df.nunique()
+    column_statistics = {
+        col: {
+            'type': dtype_map[col],
+            'null_count': int(null_counts[col]),
+            'unique_count': int(unique_counts[col])
+        }
+        for col in df.columns
+    }
+
+    return ProcessedFile(
+        file_info=file_info,
+        data_quality=data_quality,
+        sample_rows=df.head(5).to_dict('records'),
+        column_statistics=column_statistics,
+        data_json={column: df[column].array for column in df.columns}
+    )
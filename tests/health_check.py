@@ -4,77 +4,128 @@ DataSierra Health Check
 Quick verification that all core features are working
 """
 
-import os
 import sys
+import threading
 import warnings
+from importlib.util import find_spec
+from pathlib import Path
+from typing import NamedTuple
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
 # Add project root to path (go up one level from tests folder)
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-def health_check():
-    """Quick health check of DataSierra features"""
-    print("🏥 DataSierra Health Check")
-    print("=" * 30)
-    
-    checks = []
-    
-    # Check Firebase
+def _check_firebase():
+    """Connect to Firebase; returns (ok, message)"""
     try:
         from src.services.firebase_config import FirebaseConfig
         if FirebaseConfig.initialize():
-            print("✅ Firebase: Connected")
-            checks.append(True)
-        else:
-            print("❌ Firebase: Connection failed")
-            checks.append(False)
+            return True, "✅ Firebase: Connected"
+        return False, "❌ Firebase: Connection failed"
     except Exception as e:
-        print(f"❌ Firebase: Error - {str(e)}")
-        checks.append(False)
-    
-    # Check Services
+        return False, f"❌ Firebase: Error - {str(e)}"
+
+
+def _check_services():
+    """Import the core services; returns (ok, message)"""
     try:
         from src.services.auth_service import AuthService
         from src.services.file_service import FileService
         from src.services.ai_service import AIService
         from src.services.visualization_service import VisualizationService
         
-        print("✅ Services: All loaded")
-        checks.append(True)
+        return True, "✅ Services: All loaded"
     except Exception as e:
-        print(f"❌ Services: Error - {str(e)}")
-        checks.append(False)
-    
-    # Check Components
+        return False, f"❌ Services: Error - {str(e)}"
+
+
+def _check_components():
+    """Import the UI components; returns (ok, message)"""
     try:
         from src.ui.components.history import HistoryComponent
         from src.ui.components.lida_visualization import LidaVisualizationComponent
         
-        print("✅ Components: All loaded")
-        checks.append(True)
+        return True, "✅ Components: All loaded"
     except Exception as e:
-        print(f"❌ Components: Error - {str(e)}")
-        checks.append(False)
-    
-    # Check Visualization Service
+        return False, f"❌ Components: Error - {str(e)}"
+
+
+def _check_lida():
+    """Build the LIDA service and check it is usable; returns (ok, message)"""
     try:
+        if find_spec("lida") is None:
+            # Skip building the service (and its imports) when the package isn't installed
+            raise ImportError("lida package is not installed")
+        from src.config import Config
+        if not Config.is_ai_available():
+            # Without a key the service never builds a LIDA manager, so don't construct it
+            return False, "⚠️  LIDA: Not available (requires Python 3.9+ and OpenAI key)"
         from src.services.lida_visualization_service import LidaVisualizationService
         lida_service = LidaVisualizationService()
         if lida_service.is_available():
-            print("✅ LIDA: Available")
-            checks.append(True)
-        else:
-            print("⚠️  LIDA: Not available (requires Python 3.9+ and OpenAI key)")
-            checks.append(False)
+            return True, "✅ LIDA: Available"
+        return False, "⚠️  LIDA: Not available (requires Python 3.9+ and OpenAI key)"
     except Exception as e:
-        print(f"❌ LIDA: Error - {str(e)}")
-        checks.append(False)
+        return False, f"❌ LIDA: Error - {str(e)}"
+
+
+class Probe(NamedTuple):
+    """Outcome of one health check"""
+    name: str
+    ok: bool
+    msg: str
+
+
+# Each check returns (ok, message); results are reported in this order
+_CHECKS = [
+    # (name, check, run in the background)
+    ("Firebase", _check_firebase, True),
+    ("Services", _check_services, False),
+    ("Components", _check_components, False),
+    ("LIDA", _check_lida, False),
+]
+
+
+def health_check():
+    """Quick health check of DataSierra features"""
+    print("🏥 DataSierra Health Check")
+    print("=" * 30)
+    
+    # Import firebase_config on this thread before the Firebase probe starts, so the probe
+    # thread and the import checks below never first-import the src packages at the same
+    # time (concurrent first imports of one package can deadlock). If the import fails,
+    # _check_firebase hits the same error and reports it, so only ImportError is ignored here.
+    try:
+        import src.services.firebase_config
+    except ImportError:
+        pass
+    
+    # The network-bound Firebase probe runs on its own thread while the import checks run here
+    outcomes = {}
+    
+    def run(name, check):
+        outcomes[name] = Probe(name, *check())
+    
+    threads = []
+    for name, check, background in _CHECKS:
+        if background:
+            thread = threading.Thread(target=run, args=(name, check), daemon=True)
+            thread.start()
+            threads.append(thread)
+        else:
+            run(name, check)
+    for thread in threads:
+        thread.join()
+    results = [outcomes[name] for name, _, _ in _CHECKS]
+    
+    # Report every check in one write once they have all finished
+    sys.stdout.write("\n".join(probe.msg for probe in results) + "\n")
     
     # Summary
-    passed = sum(checks)
-    total = len(checks)
+    passed = sum(probe.ok for probe in results)
+    total = len(results)
     
     print("\n" + "=" * 30)
     print(f"Health Score: {passed}/{total}")
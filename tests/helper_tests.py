@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Unit tests for DataSierra's pure helpers
+Document IDs, write batching, CSS minification, content hashing, column
+classification and streamed answers; Firestore is replaced by the in-memory
+fake from _fakes.py and OpenAI by a mock
+
+Run with pytest (fixtures come from conftest.py), e.g.:
+    pytest tests/helper_tests.py
+"""
+
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+# Add the project root to the Python path (go up one level from tests folder)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.models.file_models import ProcessedFile, FileInfo, DataQuality
+from src.services.ai.openai_client import OpenAIClient
+from src.services.file_service import FileService
+from src.services.firestore_query_service import FirestoreQueryService, MAX_BATCH_OPS
+from src.services.visualization_service import VisualizationService
+from src.utils.styling import _CSS_PATH, _minify_css
+
+
+USER_ID = 'test_user_helpers'
+
+
+@pytest.fixture
+def query_service(fake_firestore):
+    service = FirestoreQueryService()
+    service.db = fake_firestore
+    return service
+
+
+def _queries_path(doc_id):
+    return ('users', USER_ID, 'queries', doc_id)
+
+
+def test_query_doc_id_is_deterministic():
+    doc_id = FirestoreQueryService._query_doc_id("Average salary?", "data.csv")
+
+    assert doc_id == FirestoreQueryService._query_doc_id("  Average salary?\n", "data.csv")
+    assert doc_id != FirestoreQueryService._query_doc_id("Average salary?", "other.csv")
+    assert doc_id != FirestoreQueryService._query_doc_id("Median salary?", "data.csv")
+    assert re.fullmatch(r"[0-9a-f]{16}", doc_id)
+
+
+def test_save_query_replaces_previous_answer(query_service, fake_firestore):
+    doc_id = query_service.save_query(USER_ID, "Average salary?", "60k", "data.csv")
+    fake_firestore.docs[_queries_path(doc_id)].update(is_helpful=True, feedback="great")
+
+    assert query_service.save_query(USER_ID, "Average salary?", "61k", "data.csv") == doc_id
+
+    saved = fake_firestore.docs[_queries_path(doc_id)]
+    assert saved['response'] == "61k"
+    assert 'is_helpful' not in saved and 'feedback' not in saved
+
+
+def test_batch_update_chunks_at_max_batch_ops(query_service, fake_firestore):
+    query_ids = [f"q{i}" for i in range(MAX_BATCH_OPS + 1)]
+    for query_id in query_ids:
+        fake_firestore.docs[_queries_path(query_id)] = {'query': query_id}
+
+    failed = query_service.batch_update(USER_ID, {query_id: ('helpful', True) for query_id in query_ids})
+
+    assert failed == {}
+    assert fake_firestore.commits == [MAX_BATCH_OPS, 1]
+    assert all(fake_firestore.docs[_queries_path(query_id)]['is_helpful'] for query_id in query_ids)
+
+
+def test_batch_update_skips_missing_queries(query_service, fake_firestore):
+    fake_firestore.docs[_queries_path('kept')] = {'query': 'kept'}
+    fake_firestore.docs[_queries_path('deleted')] = {'query': 'deleted'}
+
+    failed = query_service.batch_update(USER_ID, {
+        'kept': ('helpful', False),
+        'gone': ('helpful', True),
+        'deleted': ('delete', None),
+    })
+
+    assert failed == {'gone': 'missing'}
+    assert fake_firestore.docs[_queries_path('kept')]['is_helpful'] is False
+    assert _queries_path('deleted') not in fake_firestore.docs
+
+
+def test_save_visualizations_batch_chunks_and_keeps_order(fake_firestore):
+    viz_service = VisualizationService(db=fake_firestore)
+    viz_list = [{'query': f"chart {i}", 'file_url': ''} for i in range(MAX_BATCH_OPS + 2)]
+
+    viz_ids = viz_service.save_visualizations_batch(USER_ID, viz_list)
+
+    assert len(viz_ids) == len(viz_list)
+    assert fake_firestore.commits == [MAX_BATCH_OPS, 2]
+    first = fake_firestore.docs[('users', USER_ID, 'visualisations', viz_ids[0])]
+    assert first['query'] == "chart 0"
+    assert first['user_id'] == USER_ID and first['is_helpful'] is None
+
+
+def test_minify_css_strips_comments_and_whitespace():
+    css = "/* header */\n.main-header  h1 {\n    color : #fff ;\n    margin: 0 auto;\n}\n"
+
+    assert _minify_css(css) == ".main-header h1{color:#fff;margin:0 auto;}"
+
+
+def test_minify_css_matches_stylesheet():
+    css = _CSS_PATH.read_text(encoding='utf-8')
+    minified = _minify_css(css)
+
+    # Only comments and whitespace may change
+    without_comments = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    assert re.sub(r"\s+", "", minified) == re.sub(r"\s+", "", without_comments)
+    assert _minify_css(minified) == minified
+
+
+def test_content_hash_is_stable():
+    file_service = FileService()
+    data = {'Name': ['Alice', 'Bob'], 'Salary': [50000, 60000]}
+    content_hash = file_service._compute_content_hash(pd.DataFrame(data))
+
+    assert content_hash == file_service._compute_content_hash(pd.DataFrame(data))
+    assert content_hash != file_service._compute_content_hash(pd.DataFrame(data).iloc[::-1])
+    assert content_hash != file_service._compute_content_hash(pd.DataFrame(data).rename(columns={'Salary': 'Pay'}))
+
+
+def _processed_file(column_types, **kwargs):
+    file_info = FileInfo(
+        name="types.csv",
+        size=0,
+        type="csv",
+        upload_time=datetime.now(),
+        shape=(0, len(column_types)),
+        columns=list(column_types),
+        dtypes=dict(column_types)
+    )
+    return ProcessedFile(
+        file_info=file_info,
+        data_quality=DataQuality(total_nulls=0, duplicate_rows=0, completeness_score=100.0, uniqueness_score=100.0),
+        sample_rows=[],
+        column_statistics={col: {'type': col_type} for col, col_type in column_types.items()},
+        data_json={},
+        **kwargs
+    )
+
+
+def test_processed_file_classifies_columns():
+    processed_file = _processed_file({
+        'age': 'int64',
+        'score': 'float32',
+        'name': 'object',
+        'joined': 'datetime64[ns]',
+        'flag': 'bool',
+    })
+
+    assert processed_file.get_numeric_columns() == ['age', 'score']
+    assert processed_file.get_categorical_columns() == ['name']
+
+
+def test_processed_file_keeps_given_column_groups():
+    processed_file = _processed_file({'age': 'int64'}, numeric_cols=[], categorical_cols=['age'])
+
+    assert processed_file.get_numeric_columns() == []
+    assert processed_file.get_categorical_columns() == ['age']
+
+
+def _stream_chunk(content=None, total_tokens=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    usage = SimpleNamespace(total_tokens=total_tokens) if total_tokens is not None else None
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def test_streamed_answer_reports_token_usage():
+    client = OpenAIClient(api_key="test-key")
+    client.client = MagicMock()
+    # With include_usage the final chunk has no choices, only the usage totals
+    client.client.chat.completions.create.return_value = iter([
+        _stream_chunk("Average "), _stream_chunk("is 60k"), _stream_chunk(total_tokens=42)
+    ])
+    pieces = []
+
+    result = client.query_openai_with_data_context("Average salary?", "Salary: 50000, 70000", on_token=pieces.append)
+
+    assert result['success'] and result['answer'] == "Average is 60k"
+    assert pieces == ["Average ", "is 60k"]
+    assert result['tokens_used'] == 42
+    kwargs = client.client.chat.completions.create.call_args.kwargs
+    assert kwargs['stream'] is True
+    assert kwargs['stream_options'] == {"include_usage": True}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
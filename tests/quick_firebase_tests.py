@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Quick Integration Tests for DataSierra: Firebase-backed features
+Connection, chart upload, visualization history and feedback
+
+Run with pytest (fixtures come from conftest.py), e.g.:
+    pytest -n auto --dist=loadscope -m "not slow" tests/quick_*_tests.py
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+import pytest
+
+# Add the project root to the Python path (go up one level from tests folder)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from tests._chart_cache import cached_image
+
+
+TEST_USER_ID = 'test_user_123'
+
+
+@pytest.mark.firebase
+@pytest.mark.network
+def test_firebase_connection(firebase, services, fast):
+    """Test Firebase connection and services"""
+    if fast:
+        pytest.skip("--fast does not initialize Firebase")
+
+    assert firebase.is_initialized(), "Firebase initialization failed"
+    assert services.storage is not None, "Firebase Storage service not initialized"
+    assert services.viz.db is not None, "Visualization service has no Firestore client"
+
+
+@pytest.mark.firebase
+@pytest.mark.network
+def test_visualization_generation(services, warm_kaleido):
+    """Test visualization generation"""
+    assert isinstance(services.lida.is_available(), bool)
+
+    # Test chart generation
+    test_data = {
+        'Department': ['IT', 'HR', 'Finance'],
+        'Salary': [60000, 55000, 65000]
+    }
+
+    df = pd.DataFrame(test_data)
+    fig = px.bar(df, x='Department', y='Salary', title='Test Chart')
+
+    # Convert to image
+    img_bytes = cached_image(fig, format="webp", width=800, height=600)
+    assert img_bytes, "Chart image generation failed"
+
+    # Test visualization storage
+    upload_result = services.storage.upload_chart_image(
+        image_data=img_bytes,
+        filename="test_chart.webp",
+        user_id=TEST_USER_ID,
+        query="Test visualization",
+        content_type='image/webp'
+    )
+    assert upload_result, "Chart image upload failed"
+
+    # Test Firestore saving
+    viz_id = services.viz.save_visualization(TEST_USER_ID, upload_result)
+    assert viz_id, "Visualization metadata saving failed"
+
+
+@pytest.mark.firebase
+@pytest.mark.network
+def test_history_functionality(services):
+    """Test history functionality"""
+    # Test visualization history
+    visualizations = services.viz.get_user_visualizations(TEST_USER_ID, limit=10)
+    assert isinstance(visualizations, list)
+
+    # Test datetime formatting
+    for viz in visualizations:
+        created_at = viz.get('created_at')
+        if hasattr(created_at, 'strftime'):
+            created_at.strftime('%b %d %H:%M')
+            break
+
+    # Test query history
+    query_history = services.session.get_query_history(limit=5)
+    assert isinstance(query_history, list)
+
+
+@pytest.mark.firebase
+@pytest.mark.network
+def test_feedback_system(services):
+    """Test feedback system"""
+    # Test visualization feedback
+    visualizations = services.viz.get_user_visualizations(TEST_USER_ID, limit=1)
+    if not visualizations:
+        pytest.skip("No visualizations available for feedback testing")
+
+    viz_id = visualizations[0].get('id')
+
+    # Test helpfulness update
+    assert services.viz.update_visualization_helpfulness(TEST_USER_ID, viz_id, True), \
+        "Visualization helpfulness feedback failed"
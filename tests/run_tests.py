@@ -4,9 +4,9 @@ Simple Test Runner for DataSierra Integration Tests
 Suppresses Streamlit warnings and runs tests cleanly
 """
 
-import os
 import sys
 import warnings
+from pathlib import Path
 
 # Suppress Streamlit warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="streamlit")
@@ -14,7 +14,7 @@ warnings.filterwarnings("ignore", message=".*ScriptRunContext.*")
 warnings.filterwarnings("ignore", message=".*Session state does not function.*")
 
 # Add the project root to the Python path (go up one level from tests folder)
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 def run_tests():
     """Run the integration tests"""
@@ -22,10 +22,12 @@ def run_tests():
     print("=" * 50)
     
     try:
-        # Import and run the quick tests
-        from tests.quick_integration_tests import run_quick_tests
+        import pytest
         
-        success = run_quick_tests()
+        # Run the quick tests, network suites included; 1M-row scenarios stay opt-in
+        tests_dir = Path(__file__).resolve().parent
+        test_files = sorted(str(path) for path in tests_dir.glob("quick_*_tests.py"))
+        success = pytest.main([*test_files, "-m", "not slow"]) == pytest.ExitCode.OK
         
         if success:
             print("\n🎉 ALL INTEGRATION TESTS PASSED!")